@@ -2,35 +2,29 @@
 Main API router for v1 endpoints.
 """
 
+import importlib
+
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import (
-    auth,
-    tenants,
-    users,
-    stores,
-    products,
-    inventory,
-    customers,
-    suppliers,
-    sales,
-    purchases,
-    accounting,
-    reports
-)
+# Endpoint modules under app.api.v1.endpoints, mounted at /<module> in order
+ROUTERS = [
+    ("auth", "Authentication"),
+    ("tenants", "Tenants"),
+    ("users", "Users"),
+    ("stores", "Stores"),
+    ("products", "Products"),
+    ("inventory", "Inventory"),
+    ("customers", "Customers"),
+    ("suppliers", "Suppliers"),
+    ("sales", "Sales"),
+    ("purchases", "Purchases"),
+    ("accounting", "Accounting"),
+    ("reports", "Reports"),
+]
 
 api_router = APIRouter()
 
 # Include all endpoint routers
-api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(tenants.router, prefix="/tenants", tags=["Tenants"])
-api_router.include_router(users.router, prefix="/users", tags=["Users"])
-api_router.include_router(stores.router, prefix="/stores", tags=["Stores"])
-api_router.include_router(products.router, prefix="/products", tags=["Products"])
-api_router.include_router(inventory.router, prefix="/inventory", tags=["Inventory"])
-api_router.include_router(customers.router, prefix="/customers", tags=["Customers"])
-api_router.include_router(suppliers.router, prefix="/suppliers", tags=["Suppliers"])
-api_router.include_router(sales.router, prefix="/sales", tags=["Sales"])
-api_router.include_router(purchases.router, prefix="/purchases", tags=["Purchases"])
-api_router.include_router(accounting.router, prefix="/accounting", tags=["Accounting"])
-api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+for name, tag in ROUTERS:
+    module = importlib.import_module(f"app.api.v1.endpoints.{name}")
+    api_router.include_router(module.router, prefix=f"/{name}", tags=[tag])
@@ -2,91 +2,100 @@
 Accounting management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import DB_DEP, CREATE_ACCOUNTING, READ_ACCOUNTING, AuthenticatedUser
+from app.api.v1.responses import list_response
+from app.core.cache import invalidate_reports
 
 router = APIRouter()
 
 
-@router.get("/accounts", response_model=List[dict])
+@router.get("/accounts", response_model=None)
 async def get_accounts(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("accounting:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Get chart of accounts."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/accounts", response_model=dict)
+@router.post("/accounts", response_model=None)
 async def create_account(
-    current_user: dict = Depends(require_permission("accounting:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new account."""
     return {}
 
 
-@router.get("/journal-entries", response_model=List[dict])
+@router.get("/journal-entries", response_model=None)
 async def get_journal_entries(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("accounting:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Get journal entries."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/journal-entries", response_model=dict)
+@router.post("/journal-entries", response_model=None)
 async def create_journal_entry(
-    current_user: dict = Depends(require_permission("accounting:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new journal entry."""
+    db.commit()
+    # Only after the commit, so a report request in between cannot re-cache
+    # figures from before the write
+    await invalidate_reports(current_user.tenant_id)
     return {}
 
 
-@router.get("/invoices", response_model=List[dict])
+@router.get("/invoices", response_model=None)
 async def get_invoices(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("accounting:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Get invoices."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/invoices", response_model=dict)
+@router.post("/invoices", response_model=None)
 async def create_invoice(
-    current_user: dict = Depends(require_permission("accounting:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new invoice."""
     return {}
 
 
-@router.get("/expenses", response_model=List[dict])
+@router.get("/expenses", response_model=None)
 async def get_expenses(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("accounting:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Get expenses."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/expenses", response_model=dict)
+@router.post("/expenses", response_model=None)
 async def create_expense(
-    current_user: dict = Depends(require_permission("accounting:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_ACCOUNTING,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new expense."""
     return {}
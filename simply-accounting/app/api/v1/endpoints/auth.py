@@ -3,20 +3,26 @@ Authentication endpoints.
 """
 
 from datetime import timedelta
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate_cached_user, user_cache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import SessionLocal, async_get_db, get_db
+from app.core.permissions import permission_mask
 from app.core.security import (
     create_access_token,
     create_refresh_token,
+    forget_token,
     verify_password,
     verify_token,
     verify_refresh_token
 )
+from app.models.user import User
 from app.schemas.auth import Token, TokenRefresh, UserLogin, UserRegister
 from app.schemas.user import UserResponse
 from app.services.auth import AuthService
@@ -26,7 +32,211 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-@router.post("/register", response_model=UserResponse)
+class AuthenticatedUser(NamedTuple):
+    """Lightweight snapshot of the fields authorization checks need."""
+    id: int
+    username: str
+    tenant_id: Optional[int]
+    role: str
+    is_active: bool
+    is_superuser: bool
+    permission_mask: int
+    
+    def has_permission(self, permission: str) -> bool:
+        """Check if user has a specific permission."""
+        return bool(self.permission_mask & permission_mask(permission))
+
+
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised when a bearer token cannot be validated."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _token_subject(request: Request, token: str) -> Optional[str]:
+    """
+    Get the username for a bearer token.
+
+    AuthASGIMiddleware has normally verified the token already; it is only
+    verified here when the middleware did not run.
+    """
+    state = request.scope.get("state")
+    if state is not None and "username" in state:
+        return state["username"]
+    return verify_token(token)
+
+
+async def _authenticate(username: Optional[str], db: AsyncSession) -> AuthenticatedUser:
+    """
+    Resolve a verified token subject to a user, reading through the user cache.
+    """
+    if username is None:
+        raise _credentials_exception()
+    
+    cache_key = username.lower()
+    user = user_cache.get(cache_key)
+    if user is None:
+        user_service = UserService(db)
+        db_user = await user_service.aget_user_by_username(username)
+        
+        if db_user is None or not db_user.is_active:
+            raise _credentials_exception()
+        
+        user = AuthenticatedUser(
+            id=db_user.id,
+            username=db_user.username,
+            tenant_id=db_user.tenant_id,
+            role=db_user.role,
+            is_active=db_user.is_active,
+            is_superuser=db_user.is_superuser,
+            permission_mask=db_user.permission_mask
+        )
+        user_cache[cache_key] = user
+    
+    return user
+
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(async_get_db)
+) -> AuthenticatedUser:
+    """
+    Get current authenticated user.
+    """
+    return await _authenticate(_token_subject(request, token), db)
+
+
+async def get_current_active_user(
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
+    """
+    Get current active user.
+    """
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return current_user
+
+
+async def get_current_superuser(
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
+    """
+    Get current superuser.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
+
+
+@lru_cache(maxsize=256)
+def require_permission(permission: str):
+    """
+    Dependency to require specific permission.
+
+    Cached so every endpoint sharing a permission gets the same checker
+    callable, which FastAPI can then resolve once per request.
+    """
+    mask = permission_mask(permission)
+    
+    async def permission_checker(
+        current_user: AuthenticatedUser = Depends(get_current_user)
+    ) -> AuthenticatedUser:
+        if current_user.is_superuser:
+            return current_user
+        
+        if not current_user.permission_mask & mask:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission required: {permission}"
+            )
+        return current_user
+    
+    return permission_checker
+
+
+@lru_cache(maxsize=256)
+def require_role(role: str):
+    """
+    Dependency to require specific role.
+    """
+    async def role_checker(
+        current_user: AuthenticatedUser = Depends(get_current_user)
+    ) -> AuthenticatedUser:
+        if current_user.role != role and not current_user.is_superuser:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Role required: {role}"
+            )
+        return current_user
+    
+    return role_checker
+
+
+@lru_cache(maxsize=256)
+def make_auth_dep(permission: str):
+    """
+    Dependency to authenticate the request and require specific permission.
+
+    Inlines token verification and the user lookup instead of depending on
+    get_current_user, so endpoints resolve a single dependency level.
+    """
+    mask = permission_mask(permission)
+    
+    async def auth_dependency(
+        request: Request,
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(async_get_db)
+    ) -> AuthenticatedUser:
+        user = await _authenticate(_token_subject(request, token), db)
+        
+        if user.is_superuser:
+            return user
+        
+        if not user.permission_mask & mask:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission required: {permission}"
+            )
+        return user
+    
+    return auth_dependency
+
+
+def _update_last_login(user_id: int) -> None:
+    """
+    Record a successful login in its own session.
+
+    Runs as a background task, after the request's session has closed.
+    """
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            user.update_last_login()
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    response_model_exclude_unset=True,
+    response_model_exclude_none=True
+)
 async def register(
     user_data: UserRegister,
     db: Session = Depends(get_db)
@@ -39,8 +249,14 @@ async def register(
     return user
 
 
-@router.post("/login", response_model=Token)
+@router.post(
+    "/login",
+    response_model=Token,
+    response_model_exclude_unset=True,
+    response_model_exclude_none=True
+)
 async def login(
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ) -> Any:
@@ -69,9 +285,8 @@ async def login(
     )
     refresh_token = create_refresh_token(subject=user.username)
     
-    # Update user login info
-    user.update_last_login()
-    db.commit()
+    # Update user login info after the response is sent
+    background_tasks.add_task(_update_last_login, user.id)
     
     return {
         "access_token": access_token,
@@ -82,9 +297,15 @@ async def login(
     }
 
 
-@router.post("/login/json", response_model=Token)
+@router.post(
+    "/login/json",
+    response_model=Token,
+    response_model_exclude_unset=True,
+    response_model_exclude_none=True
+)
 async def login_json(
     user_credentials: UserLogin,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -114,9 +335,8 @@ async def login_json(
     )
     refresh_token = create_refresh_token(subject=user.username)
     
-    # Update user login info
-    user.update_last_login()
-    db.commit()
+    # Update user login info after the response is sent
+    background_tasks.add_task(_update_last_login, user.id)
     
     return {
         "access_token": access_token,
@@ -127,7 +347,12 @@ async def login_json(
     }
 
 
-@router.post("/refresh", response_model=Token)
+@router.post(
+    "/refresh",
+    response_model=Token,
+    response_model_exclude_unset=True,
+    response_model_exclude_none=True
+)
 async def refresh_token(
     token_data: TokenRefresh,
     db: Session = Depends(get_db)
@@ -166,19 +391,32 @@ async def refresh_token(
     }
 
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user(
-    current_user: dict = Depends(get_current_user)
+@router.get(
+    "/me",
+    response_model=UserResponse,
+    response_model_exclude_unset=True,
+    response_model_exclude_none=True
+)
+async def read_current_user(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ) -> Any:
     """
     Get current user information.
     """
-    return current_user
+    user_service = UserService(db)
+    user = await user_service.get_user_by_id(current_user.id)
+    
+    if user is None:
+        raise _credentials_exception()
+    
+    return user
 
 
 @router.post("/logout")
 async def logout(
-    current_user: dict = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -187,94 +425,7 @@ async def logout(
     # In a more sophisticated implementation, you would:
     # 1. Add the token to a blacklist
     # 2. Remove user sessions from database
-    # 3. Clear any cached user data
+    forget_token(token)
+    invalidate_cached_user(current_user.username)
     
     return {"message": "Successfully logged out"}
-
-
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> dict:
-    """
-    Get current authenticated user.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    username = verify_token(token)
-    if username is None:
-        raise credentials_exception
-    
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
-    
-    if user is None or not user.is_active:
-        raise credentials_exception
-    
-    return user
-
-
-async def get_current_active_user(
-    current_user: dict = Depends(get_current_user)
-) -> dict:
-    """
-    Get current active user.
-    """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
-    return current_user
-
-
-async def get_current_superuser(
-    current_user: dict = Depends(get_current_user)
-) -> dict:
-    """
-    Get current superuser.
-    """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    return current_user
-
-
-def require_permission(permission: str):
-    """
-    Dependency to require specific permission.
-    """
-    async def permission_checker(
-        current_user: dict = Depends(get_current_user)
-    ) -> dict:
-        if not current_user.has_permission(permission):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission required: {permission}"
-            )
-        return current_user
-    
-    return permission_checker
-
-
-def require_role(role: str):
-    """
-    Dependency to require specific role.
-    """
-    async def role_checker(
-        current_user: dict = Depends(get_current_user)
-    ) -> dict:
-        if current_user.role != role and not current_user.is_superuser:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Role required: {role}"
-            )
-        return current_user
-    
-    return role_checker
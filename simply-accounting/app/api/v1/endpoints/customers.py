@@ -2,51 +2,59 @@
 Customer management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_CUSTOMER,
+    DELETE_CUSTOMER,
+    READ_CUSTOMER,
+    UPDATE_CUSTOMER,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_customers(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("customer:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_CUSTOMER,
+    db: Session = DB_DEP
 ) -> Any:
     """Get list of customers."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_customer(
-    current_user: dict = Depends(require_permission("customer:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_CUSTOMER,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new customer."""
     return {}
 
 
-@router.get("/{customer_id}", response_model=dict)
+@router.get("/{customer_id}", response_model=None)
 async def get_customer(
     customer_id: int,
-    current_user: dict = Depends(require_permission("customer:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_CUSTOMER,
+    db: Session = DB_DEP
 ) -> Any:
     """Get customer by ID."""
     return {}
 
 
-@router.put("/{customer_id}", response_model=dict)
+@router.put("/{customer_id}", response_model=None)
 async def update_customer(
     customer_id: int,
-    current_user: dict = Depends(require_permission("customer:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_CUSTOMER,
+    db: Session = DB_DEP
 ) -> Any:
     """Update customer."""
     return {}
@@ -55,8 +63,8 @@ async def update_customer(
 @router.delete("/{customer_id}")
 async def delete_customer(
     customer_id: int,
-    current_user: dict = Depends(require_permission("customer:delete")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = DELETE_CUSTOMER,
+    db: Session = DB_DEP
 ) -> Any:
     """Delete customer."""
     return {"message": "Customer deleted successfully"}
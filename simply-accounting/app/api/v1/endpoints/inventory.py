@@ -2,60 +2,63 @@
 Inventory management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import DB_DEP, READ_INVENTORY, UPDATE_INVENTORY, AuthenticatedUser
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_inventory_items(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("inventory:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_INVENTORY,
+    db: Session = DB_DEP
 ) -> Any:
     """Get inventory items."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/adjustments", response_model=dict)
+@router.post("/adjustments", response_model=None)
 async def create_stock_adjustment(
-    current_user: dict = Depends(require_permission("inventory:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_INVENTORY,
+    db: Session = DB_DEP
 ) -> Any:
     """Create stock adjustment."""
     return {}
 
 
-@router.get("/movements", response_model=List[dict])
+@router.get("/movements", response_model=None)
 async def get_stock_movements(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("inventory:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_INVENTORY,
+    db: Session = DB_DEP
 ) -> Any:
     """Get stock movements."""
-    return []
+    return list_response(request, [])
 
 
-@router.get("/low-stock", response_model=List[dict])
+@router.get("/low-stock", response_model=None)
 async def get_low_stock_items(
-    current_user: dict = Depends(require_permission("inventory:read")),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: AuthenticatedUser = READ_INVENTORY,
+    db: Session = DB_DEP
 ) -> Any:
     """Get low stock items."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/transfers", response_model=dict)
+@router.post("/transfers", response_model=None)
 async def create_stock_transfer(
-    current_user: dict = Depends(require_permission("inventory:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_INVENTORY,
+    db: Session = DB_DEP
 ) -> Any:
     """Create stock transfer between stores."""
     return {}
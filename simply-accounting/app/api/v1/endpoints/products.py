@@ -2,51 +2,59 @@
 Product management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_PRODUCT,
+    DELETE_PRODUCT,
+    READ_PRODUCT,
+    UPDATE_PRODUCT,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("product:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_PRODUCT,
+    db: Session = DB_DEP
 ) -> Any:
     """Get list of products."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_product(
-    current_user: dict = Depends(require_permission("product:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_PRODUCT,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new product."""
     return {}
 
 
-@router.get("/{product_id}", response_model=dict)
+@router.get("/{product_id}", response_model=None)
 async def get_product(
     product_id: int,
-    current_user: dict = Depends(require_permission("product:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_PRODUCT,
+    db: Session = DB_DEP
 ) -> Any:
     """Get product by ID."""
     return {}
 
 
-@router.put("/{product_id}", response_model=dict)
+@router.put("/{product_id}", response_model=None)
 async def update_product(
     product_id: int,
-    current_user: dict = Depends(require_permission("product:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_PRODUCT,
+    db: Session = DB_DEP
 ) -> Any:
     """Update product."""
     return {}
@@ -55,8 +63,8 @@ async def update_product(
 @router.delete("/{product_id}")
 async def delete_product(
     product_id: int,
-    current_user: dict = Depends(require_permission("product:delete")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = DELETE_PRODUCT,
+    db: Session = DB_DEP
 ) -> Any:
     """Delete product."""
     return {"message": "Product deleted successfully"}
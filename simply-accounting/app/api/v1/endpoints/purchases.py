@@ -2,61 +2,69 @@
 Purchase management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_PURCHASE,
+    READ_PURCHASE,
+    RECEIVE_PURCHASE,
+    UPDATE_PURCHASE,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_purchases(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("purchase:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_PURCHASE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get list of purchases."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_purchase(
-    current_user: dict = Depends(require_permission("purchase:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_PURCHASE,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new purchase."""
     return {}
 
 
-@router.get("/{purchase_id}", response_model=dict)
+@router.get("/{purchase_id}", response_model=None)
 async def get_purchase(
     purchase_id: int,
-    current_user: dict = Depends(require_permission("purchase:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_PURCHASE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get purchase by ID."""
     return {}
 
 
-@router.put("/{purchase_id}", response_model=dict)
+@router.put("/{purchase_id}", response_model=None)
 async def update_purchase(
     purchase_id: int,
-    current_user: dict = Depends(require_permission("purchase:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_PURCHASE,
+    db: Session = DB_DEP
 ) -> Any:
     """Update purchase."""
     return {}
 
 
-@router.post("/{purchase_id}/receive", response_model=dict)
+@router.post("/{purchase_id}/receive", response_model=None)
 async def receive_purchase(
     purchase_id: int,
-    current_user: dict = Depends(require_permission("purchase:receive")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = RECEIVE_PURCHASE,
+    db: Session = DB_DEP
 ) -> Any:
     """Receive purchase goods."""
     return {}
@@ -2,116 +2,127 @@
 Reports and analytics endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter
+from fastapi_cache.decorator import cache
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import DB_DEP, READ_REPORTS, AuthenticatedUser
+from app.core.cache import REPORT_CACHE_EXPIRE, REPORTS_NAMESPACE, report_key_builder
 
 router = APIRouter()
 
 
-@router.get("/profit-loss", response_model=dict)
+@router.get("/profit-loss", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_profit_loss_report(
     start_date: str = None,
     end_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Profit & Loss report."""
     return {}
 
 
-@router.get("/balance-sheet", response_model=dict)
+@router.get("/balance-sheet", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_balance_sheet_report(
     as_of_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Balance Sheet report."""
     return {}
 
 
-@router.get("/cash-flow", response_model=dict)
+@router.get("/cash-flow", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_cash_flow_report(
     start_date: str = None,
     end_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Cash Flow report."""
     return {}
 
 
-@router.get("/sales-summary", response_model=dict)
+@router.get("/sales-summary", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_sales_summary_report(
     start_date: str = None,
     end_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Sales Summary report."""
     return {}
 
 
-@router.get("/inventory-valuation", response_model=dict)
+@router.get("/inventory-valuation", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_inventory_valuation_report(
     as_of_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Inventory Valuation report."""
     return {}
 
 
-@router.get("/tax-summary", response_model=dict)
+@router.get("/tax-summary", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_tax_summary_report(
     start_date: str = None,
     end_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Tax Summary report."""
     return {}
 
 
-@router.get("/customer-aging", response_model=dict)
+@router.get("/customer-aging", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_customer_aging_report(
     as_of_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Customer Aging report."""
     return {}
 
 
-@router.get("/supplier-aging", response_model=dict)
+@router.get("/supplier-aging", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_supplier_aging_report(
     as_of_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Supplier Aging report."""
     return {}
 
 
-@router.get("/daily-sales", response_model=dict)
+@router.get("/daily-sales", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_daily_sales_report(
     date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Daily Sales report."""
     return {}
 
 
-@router.get("/product-performance", response_model=dict)
+@router.get("/product-performance", response_model=None)
+@cache(expire=REPORT_CACHE_EXPIRE, namespace=REPORTS_NAMESPACE, key_builder=report_key_builder)
 async def get_product_performance_report(
     start_date: str = None,
     end_date: str = None,
-    current_user: dict = Depends(require_permission("reports:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_REPORTS,
+    db: Session = DB_DEP
 ) -> Any:
     """Get Product Performance report."""
     return {}
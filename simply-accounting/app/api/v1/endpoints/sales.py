@@ -2,80 +2,93 @@
 Sales management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_SALE,
+    READ_SALE,
+    UPDATE_SALE,
+    VOID_SALE,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
+from app.core.cache import invalidate_reports
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_sales(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("sale:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get list of sales."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_sale(
-    current_user: dict = Depends(require_permission("sale:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new sale."""
+    db.commit()
+    # Only after the commit, so a report request in between cannot re-cache
+    # figures from before the write
+    await invalidate_reports(current_user.tenant_id)
     return {}
 
 
-@router.get("/{sale_id}", response_model=dict)
+@router.get("/{sale_id}", response_model=None)
 async def get_sale(
     sale_id: int,
-    current_user: dict = Depends(require_permission("sale:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get sale by ID."""
     return {}
 
 
-@router.put("/{sale_id}", response_model=dict)
+@router.put("/{sale_id}", response_model=None)
 async def update_sale(
     sale_id: int,
-    current_user: dict = Depends(require_permission("sale:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Update sale."""
     return {}
 
 
-@router.post("/{sale_id}/void", response_model=dict)
+@router.post("/{sale_id}/void", response_model=None)
 async def void_sale(
     sale_id: int,
-    current_user: dict = Depends(require_permission("sale:void")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = VOID_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Void a sale."""
     return {}
 
 
-@router.get("/{sale_id}/receipt", response_model=dict)
+@router.get("/{sale_id}/receipt", response_model=None)
 async def get_sale_receipt(
     sale_id: int,
-    current_user: dict = Depends(require_permission("sale:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get sale receipt."""
     return {}
 
 
-@router.post("/pos", response_model=dict)
+@router.post("/pos", response_model=None)
 async def pos_sale(
-    current_user: dict = Depends(require_permission("sale:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_SALE,
+    db: Session = DB_DEP
 ) -> Any:
     """Process POS sale."""
     return {}
@@ -2,51 +2,59 @@
 Store management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_STORE,
+    DELETE_STORE,
+    READ_STORE,
+    UPDATE_STORE,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_stores(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("store:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_STORE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get list of stores."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_store(
-    current_user: dict = Depends(require_permission("store:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_STORE,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new store."""
     return {}
 
 
-@router.get("/{store_id}", response_model=dict)
+@router.get("/{store_id}", response_model=None)
 async def get_store(
     store_id: int,
-    current_user: dict = Depends(require_permission("store:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_STORE,
+    db: Session = DB_DEP
 ) -> Any:
     """Get store by ID."""
     return {}
 
 
-@router.put("/{store_id}", response_model=dict)
+@router.put("/{store_id}", response_model=None)
 async def update_store(
     store_id: int,
-    current_user: dict = Depends(require_permission("store:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_STORE,
+    db: Session = DB_DEP
 ) -> Any:
     """Update store."""
     return {}
@@ -55,8 +63,8 @@ async def update_store(
 @router.delete("/{store_id}")
 async def delete_store(
     store_id: int,
-    current_user: dict = Depends(require_permission("store:delete")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = DELETE_STORE,
+    db: Session = DB_DEP
 ) -> Any:
     """Delete store."""
     return {"message": "Store deleted successfully"}
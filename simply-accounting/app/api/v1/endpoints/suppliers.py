@@ -2,51 +2,59 @@
 Supplier management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any
+from fastapi import APIRouter, Request
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_SUPPLIER,
+    DELETE_SUPPLIER,
+    READ_SUPPLIER,
+    UPDATE_SUPPLIER,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_suppliers(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("supplier:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_SUPPLIER,
+    db: Session = DB_DEP
 ) -> Any:
     """Get list of suppliers."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_supplier(
-    current_user: dict = Depends(require_permission("supplier:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_SUPPLIER,
+    db: Session = DB_DEP
 ) -> Any:
     """Create a new supplier."""
     return {}
 
 
-@router.get("/{supplier_id}", response_model=dict)
+@router.get("/{supplier_id}", response_model=None)
 async def get_supplier(
     supplier_id: int,
-    current_user: dict = Depends(require_permission("supplier:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_SUPPLIER,
+    db: Session = DB_DEP
 ) -> Any:
     """Get supplier by ID."""
     return {}
 
 
-@router.put("/{supplier_id}", response_model=dict)
+@router.put("/{supplier_id}", response_model=None)
 async def update_supplier(
     supplier_id: int,
-    current_user: dict = Depends(require_permission("supplier:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_SUPPLIER,
+    db: Session = DB_DEP
 ) -> Any:
     """Update supplier."""
     return {}
@@ -55,8 +63,8 @@ async def update_supplier(
 @router.delete("/{supplier_id}")
 async def delete_supplier(
     supplier_id: int,
-    current_user: dict = Depends(require_permission("supplier:delete")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = DELETE_SUPPLIER,
+    db: Session = DB_DEP
 ) -> Any:
     """Delete supplier."""
     return {"message": "Supplier deleted successfully"}
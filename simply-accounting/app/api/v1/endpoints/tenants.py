@@ -2,34 +2,42 @@
 Tenant management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+from fastapi import APIRouter, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import get_current_user, require_permission
+from app.api.v1.deps import (
+    DB_DEP,
+    CREATE_TENANT,
+    DELETE_TENANT,
+    READ_TENANT,
+    UPDATE_TENANT,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_tenants(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("tenant:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_TENANT,
+    db: Session = DB_DEP
 ) -> Any:
     """
     Get list of tenants.
     """
     # Implementation will be added
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_tenant(
-    current_user: dict = Depends(require_permission("tenant:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_TENANT,
+    db: Session = DB_DEP
 ) -> Any:
     """
     Create a new tenant.
@@ -38,11 +46,11 @@ async def create_tenant(
     return {}
 
 
-@router.get("/{tenant_id}", response_model=dict)
+@router.get("/{tenant_id}", response_model=None)
 async def get_tenant(
     tenant_id: int,
-    current_user: dict = Depends(require_permission("tenant:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_TENANT,
+    db: Session = DB_DEP
 ) -> Any:
     """
     Get tenant by ID.
@@ -51,11 +59,11 @@ async def get_tenant(
     return {}
 
 
-@router.put("/{tenant_id}", response_model=dict)
+@router.put("/{tenant_id}", response_model=None)
 async def update_tenant(
     tenant_id: int,
-    current_user: dict = Depends(require_permission("tenant:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_TENANT,
+    db: Session = DB_DEP
 ) -> Any:
     """
     Update tenant.
@@ -67,8 +75,8 @@ async def update_tenant(
 @router.delete("/{tenant_id}")
 async def delete_tenant(
     tenant_id: int,
-    current_user: dict = Depends(require_permission("tenant:delete")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = DELETE_TENANT,
+    db: Session = DB_DEP
 ) -> Any:
     """
     Delete tenant.
@@ -2,51 +2,59 @@
 User management endpoints.
 """
 
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any
+from fastapi import APIRouter, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import get_current_user, require_permission
+from app.api.v1.deps import (
+    ASYNC_DB_DEP,
+    CREATE_USER,
+    DELETE_USER,
+    READ_USER,
+    UPDATE_USER,
+    AuthenticatedUser
+)
+from app.api.v1.responses import list_response
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
+@router.get("/", response_model=None)
 async def get_users(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: dict = Depends(require_permission("user:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_USER,
+    db: AsyncSession = ASYNC_DB_DEP
 ) -> Any:
     """Get list of users."""
-    return []
+    return list_response(request, [])
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=None)
 async def create_user(
-    current_user: dict = Depends(require_permission("user:create")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = CREATE_USER,
+    db: AsyncSession = ASYNC_DB_DEP
 ) -> Any:
     """Create a new user."""
     return {}
 
 
-@router.get("/{user_id}", response_model=dict)
+@router.get("/{user_id}", response_model=None)
 async def get_user(
     user_id: int,
-    current_user: dict = Depends(require_permission("user:read")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = READ_USER,
+    db: AsyncSession = ASYNC_DB_DEP
 ) -> Any:
     """Get user by ID."""
     return {}
 
 
-@router.put("/{user_id}", response_model=dict)
+@router.put("/{user_id}", response_model=None)
 async def update_user(
     user_id: int,
-    current_user: dict = Depends(require_permission("user:update")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = UPDATE_USER,
+    db: AsyncSession = ASYNC_DB_DEP
 ) -> Any:
     """Update user."""
     return {}
@@ -55,8 +63,8 @@ async def update_user(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
-    current_user: dict = Depends(require_permission("user:delete")),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = DELETE_USER,
+    db: AsyncSession = ASYNC_DB_DEP
 ) -> Any:
     """Delete user."""
     return {"message": "User deleted successfully"}
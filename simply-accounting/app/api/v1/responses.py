@@ -0,0 +1,37 @@
+"""
+Shared response helpers for v1 endpoints.
+"""
+
+from typing import Any
+
+from fastapi import Request, Response, status
+
+EMPTY_LIST_BODY = b"[]"
+EMPTY_LIST_ETAG = '"empty"'
+EMPTY_LIST_HEADERS = {
+    "ETag": EMPTY_LIST_ETAG,
+    "Cache-Control": "private, max-age=5",
+}
+
+
+def list_response(request: Request, rows: list) -> Any:
+    """
+    Return list rows, short-circuiting empty results.
+
+    An empty result is sent as a pre-encoded body with a fixed ETag, and a
+    client that already holds that ETag gets a 304 with no body.
+    """
+    if rows:
+        return rows
+
+    if request.headers.get("if-none-match") == EMPTY_LIST_ETAG:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=EMPTY_LIST_HEADERS
+        )
+
+    return Response(
+        content=EMPTY_LIST_BODY,
+        media_type="application/json",
+        headers=EMPTY_LIST_HEADERS
+    )
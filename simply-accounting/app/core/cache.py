@@ -0,0 +1,73 @@
+"""
+Response caching backed by Redis.
+"""
+
+from typing import Any, Callable, Optional
+
+from cachetools import TTLCache
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+CACHE_PREFIX = "rpt"
+REPORTS_NAMESPACE = "reports"
+REPORT_CACHE_EXPIRE = 60  # seconds
+
+# Authenticated users keyed by lowercased username. Only touched from the
+# event loop with no await between lookup and store, so no lock is required.
+user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def init_cache() -> None:
+    """
+    Initialize the response cache backend.
+    """
+    redis = aioredis.from_url(settings.REDIS_URL)
+    FastAPICache.init(RedisBackend(redis), prefix=CACHE_PREFIX)
+
+
+def report_key_builder(
+    func: Callable,
+    namespace: str = "",
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Optional[tuple] = None,
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    Build a report cache key scoped to the caller's tenant.
+
+    fastapi-cache passes the namespace already joined with the cache prefix.
+    Keys are laid out as <prefix>:<namespace>:<tenant_id>:<path>:<params> so
+    one tenant's reports can be cleared without touching the others.
+    """
+    kwargs = kwargs or {}
+    current_user = kwargs.get("current_user")
+    tenant_id = getattr(current_user, "tenant_id", None)
+    params = sorted(
+        (name, value)
+        for name, value in kwargs.items()
+        if name not in ("current_user", "db")
+    )
+    return f"{namespace}:{tenant_id}:{request.url.path}:{params}"
+
+
+async def invalidate_reports(tenant_id: Any) -> None:
+    """
+    Clear cached reports for a tenant after its books change.
+    """
+    await FastAPICache.clear(namespace=f"{REPORTS_NAMESPACE}:{tenant_id}")
+
+
+def invalidate_cached_user(username: str) -> None:
+    """
+    Drop a cached user so the next request reloads it from the database.
+
+    Call after any change to a user's password, role, permissions or
+    active/deleted state.
+    """
+    user_cache.pop(username.lower(), None)
+
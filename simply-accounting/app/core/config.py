@@ -2,10 +2,10 @@
 Configuration settings for the Simply Accounting application.
 """
 
+from functools import lru_cache
 from typing import Optional, List
 from pydantic_settings import BaseSettings
 from pydantic import validator
-import os
 
 
 class Settings(BaseSettings):
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12
     
     # Database
     DATABASE_URL: Optional[str] = None
@@ -27,6 +28,10 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "simply_accounting"
     DATABASE_USER: str = "root"
     DATABASE_PASSWORD: str = ""
+    DATABASE_POOL_SIZE: int = 25
+    DATABASE_MAX_OVERFLOW: int = 25
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds
+    DATABASE_INSERT_PAGE_SIZE: int = 10000  # rows per batched multi-row INSERT
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -71,13 +76,22 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"mysql+pymysql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
     
+    @property
+    def async_database_url(self) -> str:
+        return self.database_url.replace("+pymysql", "+aiomysql", 1)
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 
-# Create settings instance
-settings = Settings()
+@lru_cache()
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings, parsing the environment only once.
+    """
+    return Settings()
 
-# Create upload directory if it doesn't exist
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+# Create settings instance
+settings = get_settings()
@@ -3,27 +3,51 @@ Database configuration and session management.
 """
 
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import logging
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create database engine
+# Create database engine. Bulk writes should go through
+# session.execute(insert(Model), rows), which is sent as batched multi-row
+# INSERTs rather than one statement per session.add()
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_use_lifo=True,
+    insertmanyvalues_page_size=settings.DATABASE_INSERT_PAGE_SIZE,
     echo=settings.DEBUG,
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine for request paths that must not block the event loop
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_pre_ping=True,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_use_lifo=True,
+    insertmanyvalues_page_size=settings.DATABASE_INSERT_PAGE_SIZE,
+    echo=settings.DEBUG,
+)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -54,6 +78,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def async_get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
+
 def create_tables():
     """
     Create all tables in the database.
@@ -0,0 +1,60 @@
+"""
+Pure ASGI middleware.
+
+These wrap the ASGI callable directly instead of going through
+BaseHTTPMiddleware, so no Request/Response objects are built per request.
+"""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.security import verify_token
+
+
+class ProcessTimeMiddleware:
+    """Add processing time to response headers."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.time()
+        
+        async def send_with_process_time(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.time() - start_time))
+            await send(message)
+        
+        await self.app(scope, receive, send_with_process_time)
+
+
+class AuthASGIMiddleware:
+    """
+    Verify bearer tokens once per request.
+    
+    The verified username (or None for an invalid token) is stored in
+    scope["state"]["username"], where the auth dependencies pick it up.
+    Requests are never rejected here; missing or invalid credentials are
+    still answered by the dependencies, so public routes keep working.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token:
+                        scope.setdefault("state", {})["username"] = verify_token(token)
+                    break
+        
+        await self.app(scope, receive, send)
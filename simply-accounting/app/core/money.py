@@ -0,0 +1,44 @@
+"""
+Exact money arithmetic in integer minor units.
+
+Amounts are stored as Numeric columns, but line calculations convert them
+to integers (cents for money, thousandths for quantities, ten-thousandths
+for rates and unit costs) so multiplication and rounding stay exact and
+avoid float error.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any
+
+MONEY_PLACES = 2
+QUANTITY_PLACES = 3
+RATE_PLACES = 4
+UNIT_COST_PLACES = 4
+
+
+def to_minor_units(value: Any, places: int = MONEY_PLACES) -> int:
+    """
+    Convert an amount to an integer count of 10**-places units.
+    """
+    if value is None:
+        return 0
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(places).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_minor_units(units: int, places: int = MONEY_PLACES) -> Decimal:
+    """
+    Convert an integer count of 10**-places units back to a Decimal.
+    """
+    return Decimal(units).scaleb(-places)
+
+
+def div_round_half_up(numerator: int, denominator: int) -> int:
+    """
+    Integer division rounded half away from zero, like ROUND_HALF_UP.
+    """
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
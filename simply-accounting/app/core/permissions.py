@@ -0,0 +1,50 @@
+"""
+Permission bitmasks for fast authorization checks.
+"""
+
+from typing import Dict, Iterable
+
+from app.core.security import PermissionChecker
+
+# Every permission granted to at least one role, each assigned one bit
+ALL_PERMISSIONS = sorted({
+    permission
+    for role_permissions in PermissionChecker.PERMISSIONS.values()
+    for permission in role_permissions
+})
+
+PERMISSION_BITS: Dict[str, int] = {
+    permission: 1 << index for index, permission in enumerate(ALL_PERMISSIONS)
+}
+
+
+def permissions_to_mask(permissions: Iterable[str]) -> int:
+    """
+    Combine permission strings into a single bitmask.
+    """
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS.get(permission, 0)
+    return mask
+
+
+ROLE_MASKS: Dict[str, int] = {
+    role: permissions_to_mask(role_permissions)
+    for role, role_permissions in PermissionChecker.PERMISSIONS.items()
+}
+
+
+def permission_mask(permission: str) -> int:
+    """
+    Get the bit for a permission.
+
+    Permissions no role grants map to 0, so checks against them always fail.
+    """
+    return PERMISSION_BITS.get(permission, 0)
+
+
+def role_permission_mask(user_role: str) -> int:
+    """
+    Get the combined permission bitmask for a role.
+    """
+    return ROLE_MASKS.get(user_role.lower(), 0)
@@ -2,17 +2,133 @@
 Security utilities for authentication and authorization.
 """
 
+import base64
+import bcrypt
+import hashlib
+import hmac
+import json
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Union
 from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# Hash identifiers bcrypt.checkpw understands without going through passlib
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Pre-keyed HMAC state for HS256 tokens; copied per verification instead of
+# re-deriving the key schedule on every request.
+_hmac_prototype = (
+    hmac.new(settings.SECRET_KEY.encode(), digestmod=hashlib.sha256)
+    if settings.ALGORITHM == "HS256"
+    else None
+)
+
+# Verified tokens keyed by SHA-256 digest and mapped to (username, exp),
+# least recently used first. Access and refresh tokens are kept apart so a
+# refresh token is never accepted as an access token or vice versa.
+_TOKEN_CACHE_MAXSIZE = 50_000
+_token_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+_refresh_token_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+
+def _token_digest(token: str) -> bytes:
+    """Cache key for a token, so raw tokens are not held in memory."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _get_cached_subject(
+    cache: "OrderedDict[bytes, Tuple[str, float]]", key: bytes
+) -> Optional[str]:
+    """Return the cached subject for a token digest if it has not expired."""
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    
+    username, exp = cached
+    if exp > time.time():
+        cache.move_to_end(key)
+        return username
+    cache.pop(key, None)
+    return None
+
+
+def _cache_subject(
+    cache: "OrderedDict[bytes, Tuple[str, float]]",
+    key: bytes,
+    username: str,
+    payload: dict
+) -> None:
+    """Remember a verified token until its expiry."""
+    exp = payload.get("exp")
+    if exp is None:
+        return
+    
+    cache[key] = (username, float(exp))
+    if len(cache) > _TOKEN_CACHE_MAXSIZE:
+        cache.popitem(last=False)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _decode_token(token: str) -> dict:
+    """
+    Verify a JWT signature and expiry and return its payload.
+
+    HS256 tokens are checked against the pre-keyed HMAC; any other
+    configured algorithm goes through python-jose. Raises JWTError when
+    the token is invalid.
+    """
+    if _hmac_prototype is None:
+        return jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        header = json.loads(_b64url_decode(header_segment))
+        payload = json.loads(_b64url_decode(payload_segment))
+        signature = _b64url_decode(signature_segment)
+    except (ValueError, TypeError) as e:
+        raise JWTError("Invalid token") from e
+    
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise JWTError("Invalid token algorithm")
+    
+    signer = _hmac_prototype.copy()
+    signer.update(f"{header_segment}.{payload_segment}".encode())
+    if not hmac.compare_digest(signer.digest(), signature):
+        raise JWTError("Signature verification failed")
+    
+    if not isinstance(payload, dict):
+        raise JWTError("Invalid token payload")
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise JWTError("Invalid expiration claim")
+        if exp < time.time():
+            raise ExpiredSignatureError("Signature has expired")
+    
+    return payload
 
 
 def create_access_token(
@@ -36,23 +152,61 @@ def create_access_token(
 def verify_token(token: str) -> Optional[str]:
     """
     Verify and decode a JWT token.
+
+    Tokens are immutable until they expire, so a verified token is cached
+    and later requests presenting it skip signature verification.
     """
+    key = _token_digest(token)
+    username = _get_cached_subject(_token_cache, key)
+    if username is not None:
+        return username
+    
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             return None
-        return username
     except JWTError:
         return None
+    
+    _cache_subject(_token_cache, key, username, payload)
+    return username
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def forget_token(token: str) -> None:
+    """
+    Drop a token from the verification caches, e.g. on logout.
+    """
+    key = _token_digest(token)
+    _token_cache.pop(key, None)
+    _refresh_token_cache.pop(key, None)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
+
+    bcrypt is deliberately slow, so the check runs in the threadpool to
+    keep it off the event loop.
+    """
+    return await run_in_threadpool(
+        _verify_password_sync, plain_password, hashed_password
+    )
+
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """
+    Check a password, calling bcrypt directly for bcrypt hashes.
+
+    Only hashes in another scheme go through passlib's dispatcher.
     """
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode(), hashed_password.encode()
+            )
+        except ValueError:
+            return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -77,18 +231,23 @@ def verify_refresh_token(token: str) -> Optional[str]:
     """
     Verify and decode a JWT refresh token.
     """
+    key = _token_digest(token)
+    username = _get_cached_subject(_refresh_token_cache, key)
+    if username is not None:
+        return username
+    
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = _decode_token(token)
         username: str = payload.get("sub")
         token_type: str = payload.get("type")
         
         if username is None or token_type != "refresh":
             return None
-        return username
     except JWTError:
         return None
+    
+    _cache_subject(_refresh_token_cache, key, username, payload)
+    return username
 
 
 class PermissionChecker:
@@ -96,9 +255,10 @@ class PermissionChecker:
     Class to check user permissions for different operations.
     """
     
-    # Define permission levels
+    # Define permission levels. Roles map to frozensets so each check is a
+    # single hash lookup.
     PERMISSIONS = {
-        "admin": [
+        "admin": frozenset({
             "user:create", "user:read", "user:update", "user:delete",
             "tenant:create", "tenant:read", "tenant:update", "tenant:delete",
             "store:create", "store:read", "store:update", "store:delete",
@@ -110,8 +270,8 @@ class PermissionChecker:
             "accounting:create", "accounting:read", "accounting:update", "accounting:delete",
             "report:read", "report:export",
             "system:configure"
-        ],
-        "manager": [
+        }),
+        "manager": frozenset({
             "user:read", "user:update",
             "store:read", "store:update",
             "product:create", "product:read", "product:update", "product:delete",
@@ -121,22 +281,22 @@ class PermissionChecker:
             "supplier:create", "supplier:read", "supplier:update", "supplier:delete",
             "accounting:create", "accounting:read", "accounting:update",
             "report:read", "report:export"
-        ],
-        "supervisor": [
+        }),
+        "supervisor": frozenset({
             "product:read", "product:update",
             "inventory:read", "inventory:update",
             "sale:create", "sale:read", "sale:update", "sale:delete",
             "customer:create", "customer:read", "customer:update",
             "accounting:read",
             "report:read"
-        ],
-        "cashier": [
+        }),
+        "cashier": frozenset({
             "product:read",
             "inventory:read",
             "sale:create", "sale:read",
             "customer:read", "customer:update"
-        ],
-        "auditor": [
+        }),
+        "auditor": frozenset({
             "product:read",
             "inventory:read",
             "sale:read",
@@ -144,23 +304,46 @@ class PermissionChecker:
             "supplier:read",
             "accounting:read",
             "report:read", "report:export"
-        ]
+        })
     }
     
+    # Inverse of PERMISSIONS, filled in below the class
+    ROLES_BY_PERMISSION: Dict[str, FrozenSet[str]] = {}
+    
     @classmethod
     def has_permission(cls, user_role: str, permission: str) -> bool:
         """
         Check if a user role has a specific permission.
         """
-        role_permissions = cls.PERMISSIONS.get(user_role.lower(), [])
+        role_permissions = cls.PERMISSIONS.get(user_role.lower(), frozenset())
         return permission in role_permissions
     
-    @classmethod
-    def get_role_permissions(cls, user_role: str) -> list:
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def get_role_permissions(user_role: str) -> FrozenSet[str]:
         """
         Get all permissions for a specific role.
+
+        The result is cached per role and immutable, so callers can share it.
+        """
+        return frozenset(PermissionChecker.PERMISSIONS.get(user_role.lower(), ()))
+    
+    @classmethod
+    def roles_with(cls, permission: str) -> FrozenSet[str]:
         """
-        return cls.PERMISSIONS.get(user_role.lower(), [])
+        Get all roles that grant a specific permission.
+        """
+        return cls.ROLES_BY_PERMISSION.get(permission, frozenset())
+
+
+PermissionChecker.ROLES_BY_PERMISSION = {
+    permission: frozenset(
+        role
+        for role, role_permissions in PermissionChecker.PERMISSIONS.items()
+        if permission in role_permissions
+    )
+    for permission in frozenset().union(*PermissionChecker.PERMISSIONS.values())
+}
 
 
 def check_permission(required_permission: str):
@@ -5,14 +5,17 @@ Main FastAPI application for Simply Accounting.
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
+import os
 import time
 
+from app.core.cache import init_cache
 from app.core.config import settings
 from app.core.database import create_tables
+from app.core.middleware import AuthASGIMiddleware, ProcessTimeMiddleware
 from app.api.v1.api import api_router
 
 # Configure logging
@@ -30,6 +33,7 @@ app = FastAPI(
     openapi_url="/api/v1/openapi.json" if settings.DEBUG else None,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -49,15 +53,9 @@ if settings.ENVIRONMENT == "production":
     )
 
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time to response headers."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Request timing and bearer token middleware
+app.add_middleware(AuthASGIMiddleware)
+app.add_middleware(ProcessTimeMiddleware)
 
 
 # Exception handlers
@@ -122,6 +120,9 @@ async def startup_event():
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
     
+    # Create upload directory if it doesn't exist
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    
     try:
         # Create database tables
         create_tables()
@@ -129,6 +130,9 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
+    
+    init_cache()
+    logger.info("Response cache initialized")
 
 
 @app.on_event("shutdown")
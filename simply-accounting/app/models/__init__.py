@@ -10,7 +10,7 @@ from .product import Product, ProductVariant, ProductCategory
 from .inventory import InventoryItem, StockMovement, StockAdjustment
 from .customer import Customer
 from .supplier import Supplier
-from .sale import Sale, SaleItem
+from .sale import Sale, SaleItem, SalesDailyRollup
 from .accounting import Account, Transaction, TransactionEntry
 from .purchase import PurchaseOrder, PurchaseOrderItem
 
@@ -29,6 +29,7 @@ __all__ = [
     "Supplier",
     "Sale",
     "SaleItem",
+    "SalesDailyRollup",
     "Account",
     "Transaction",
     "TransactionEntry",
@@ -3,10 +3,19 @@ Accounting models for financial management.
 """
 
 from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, DateTime, Enum, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Index, case, select, update
+from sqlalchemy.orm import deferred, object_session, relationship, selectinload
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
-from app.models.base import BaseModel, TenantMixin
+from app.core.money import (
+    MONEY_PLACES,
+    QUANTITY_PLACES,
+    RATE_PLACES,
+    div_round_half_up,
+    from_minor_units,
+    to_minor_units
+)
+from app.models.base import BaseModel, TenantMixin, track_materialized_path
 
 
 class AccountType(PyEnum):
@@ -61,11 +70,18 @@ class TransactionType(PyEnum):
     CLOSING_ENTRY = "closing_entry"
 
 
+# Account types whose balance increases with debits
+DEBIT_ACCOUNT_TYPES = (AccountType.ASSET, AccountType.EXPENSE)
+
+
 class Account(BaseModel, TenantMixin):
     """
     Chart of accounts model for financial tracking.
     """
     __tablename__ = "accounts"
+    __table_args__ = (
+        Index("ix_accounts_tenant_type", "tenant_id", "account_type"),
+    )
     
     # Account Information
     account_number = Column(String(20), nullable=False, index=True)
@@ -75,6 +91,7 @@ class Account(BaseModel, TenantMixin):
     
     # Hierarchy
     parent_account_id = Column(ForeignKey("accounts.id"), nullable=True, index=True)
+    materialized_path = Column(String(500), nullable=True, index=True)  # "/<root id>/.../<own id>/"
     
     # Account Details
     description = Column(Text, nullable=True)
@@ -107,9 +124,23 @@ class Account(BaseModel, TenantMixin):
     def __repr__(self):
         return f"<Account(id={self.id}, number='{self.account_number}', name='{self.account_name}')>"
     
+    @property
+    def path_ids(self):
+        """Get the IDs from the root account down to this one."""
+        return [int(part) for part in self.materialized_path.strip("/").split("/")]
+    
     @property
     def full_name(self):
         """Get full account name with parent hierarchy."""
+        session = object_session(self)
+        if session is not None and self.materialized_path:
+            ids = self.path_ids
+            names = dict(session.execute(
+                select(Account.id, Account.account_name).where(Account.id.in_(ids))
+            ).all())
+            names[self.id] = self.account_name
+            return " > ".join(names[account_id] for account_id in ids)
+        
         if self.parent_account:
             return f"{self.parent_account.full_name} > {self.account_name}"
         return self.account_name
@@ -117,7 +148,7 @@ class Account(BaseModel, TenantMixin):
     @property
     def is_debit_account(self):
         """Check if account increases with debits."""
-        return self.account_type in [AccountType.ASSET, AccountType.EXPENSE]
+        return self.account_type in DEBIT_ACCOUNT_TYPES
     
     @property
     def is_credit_account(self):
@@ -148,6 +179,29 @@ class Account(BaseModel, TenantMixin):
     
     def get_children_recursive(self):
         """Get all descendant accounts."""
+        session = object_session(self)
+        if session is not None and self.materialized_path:
+            descendants = session.execute(
+                select(Account)
+                .where(Account.materialized_path.like(f"{self.materialized_path}%"))
+                .where(Account.id != self.id)
+                .order_by(Account.materialized_path)
+            ).scalars()
+            
+            # Paths sort parents before their subtrees, so skipping the
+            # subtree under an inactive account matches the recursive walk
+            children = []
+            skipped_prefix = None
+            for child in descendants:
+                if skipped_prefix and child.materialized_path.startswith(skipped_prefix):
+                    continue
+                if child.is_active and not child.is_deleted:
+                    children.append(child)
+                    skipped_prefix = None
+                else:
+                    skipped_prefix = child.materialized_path
+            return children
+        
         children = []
         for child in self.child_accounts:
             if child.is_active and not child.is_deleted:
@@ -171,11 +225,17 @@ class Account(BaseModel, TenantMixin):
         return True
 
 
+track_materialized_path(Account, "parent_account_id")
+
+
 class Transaction(BaseModel, TenantMixin):
     """
     Financial transaction model for double-entry bookkeeping.
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_tenant_date", "tenant_id", "transaction_date"),
+    )
     
     # Transaction Information
     transaction_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -207,13 +267,17 @@ class Transaction(BaseModel, TenantMixin):
     reversed_by_transaction_id = Column(ForeignKey("transactions.id"), nullable=True)
     reversal_reason = Column(Text, nullable=True)
     
-    # Additional Data
-    metadata = Column(JSON, nullable=True)
+    # Additional Data. Stored in the "metadata" column, which is a reserved
+    # attribute name on declarative models, and deferred because listings
+    # never read it.
+    extra_data = deferred(Column("metadata", JSON, nullable=True))
     
     # Relationships
     tenant = relationship("Tenant")
     posted_by = relationship("User")
     reversed_by_transaction = relationship("Transaction", remote_side="Transaction.id")
+    # Left lazy so calculate_totals() can sum unloaded entries in SQL; use
+    # load_with_entries() where the entries themselves are shown
     entries = relationship("TransactionEntry", back_populates="transaction", cascade="all, delete-orphan")
     
     def __repr__(self):
@@ -231,8 +295,32 @@ class Transaction(BaseModel, TenantMixin):
                 not self.reversed_by_transaction_id and 
                 not self.is_reconciled)
     
+    @classmethod
+    def load_with_entries(cls, session, transaction_ids):
+        """
+        Load transactions with their entries, in one IN query for all entries.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id.in_(transaction_ids))
+            .options(selectinload(cls.entries))
+        ).scalars().all()
+    
     def calculate_totals(self):
         """Calculate total debits and credits."""
+        session = object_session(self)
+        if session is not None and self.id is not None and "entries" not in self.__dict__:
+            # Entries are not loaded; let the database add them up
+            total_debit, total_credit = session.execute(
+                select(
+                    func.coalesce(func.sum(TransactionEntry.debit_amount), 0),
+                    func.coalesce(func.sum(TransactionEntry.credit_amount), 0)
+                ).where(TransactionEntry.transaction_id == self.id)
+            ).one()
+            self.total_debit = total_debit
+            self.total_credit = total_credit
+            return
+        
         self.total_debit = sum(entry.debit_amount for entry in self.entries)
         self.total_credit = sum(entry.credit_amount for entry in self.entries)
     
@@ -259,16 +347,57 @@ class Transaction(BaseModel, TenantMixin):
             raise ValueError("Transaction must be balanced before posting")
         
         # Update account balances
-        for entry in self.entries:
-            if entry.debit_amount > 0:
-                entry.account.update_balance(float(entry.debit_amount), True)
-            if entry.credit_amount > 0:
-                entry.account.update_balance(float(entry.credit_amount), False)
+        self._apply_to_balances()
         
         self.status = "posted"
         self.posted_by_user_id = user_id
         self.posted_at = func.now()
     
+    def _apply_to_balances(self):
+        """
+        Apply the entries to their accounts' current balances.
+
+        In a session this is one UPDATE computed in the database, which
+        avoids loading each account and lost updates from concurrent posts.
+        """
+        session = object_session(self)
+        if session is None:
+            for entry in self.entries:
+                if entry.debit_amount > 0:
+                    entry.account.update_balance(entry.debit_amount, True)
+                if entry.credit_amount > 0:
+                    entry.account.update_balance(entry.credit_amount, False)
+            return
+        
+        # Net debit per account
+        net_debits = {}
+        for entry in self.entries:
+            net_debits[entry.account_id] = (
+                net_debits.get(entry.account_id, 0)
+                + (entry.debit_amount or 0)
+                - (entry.credit_amount or 0)
+            )
+        if not net_debits:
+            return
+        
+        net_debit = case(net_debits, value=Account.id)
+        session.execute(
+            update(Account)
+            .where(Account.id.in_(net_debits))
+            .values(
+                current_balance=Account.current_balance + case(
+                    (Account.account_type.in_(DEBIT_ACCOUNT_TYPES), net_debit),
+                    else_=-net_debit
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        
+        # Accounts already in the session reload their balance on next access
+        for obj in list(session.identity_map.values()):
+            if isinstance(obj, Account) and obj.id in net_debits:
+                session.expire(obj, ["current_balance"])
+    
     def reverse(self, reason: str, user_id: int = None):
         """Create a reversal transaction."""
         if not self.can_be_reversed:
@@ -308,9 +437,12 @@ class TransactionEntry(BaseModel):
     Individual entries within a transaction (journal entries).
     """
     __tablename__ = "transaction_entries"
+    __table_args__ = (
+        Index("ix_transaction_entries_account_txn", "account_id", "transaction_id"),
+    )
     
     transaction_id = Column(ForeignKey("transactions.id"), nullable=False, index=True)
-    account_id = Column(ForeignKey("accounts.id"), nullable=False, index=True)
+    account_id = Column(ForeignKey("accounts.id"), nullable=False)  # Leads ix_transaction_entries_account_txn
     
     # Entry Amounts
     debit_amount = Column(Numeric(15, 2), default=0, nullable=False)
@@ -399,6 +531,7 @@ class Invoice(BaseModel, TenantMixin):
     # Relationships
     tenant = relationship("Tenant")
     customer = relationship("Customer")
+    # Left lazy; use load_with_items() where the lines themselves are shown
     invoice_items = relationship("InvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
     
     def __repr__(self):
@@ -416,6 +549,45 @@ class Invoice(BaseModel, TenantMixin):
         return (self.status not in ["paid", "cancelled"] and 
                 self.due_date < datetime.utcnow())
     
+    @classmethod
+    def load_with_items(cls, session, invoice_ids):
+        """
+        Load invoices with their items, in one IN query for all items.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id.in_(invoice_ids))
+            .options(selectinload(cls.invoice_items))
+        ).scalars().all()
+    
+    def recompute_all(self):
+        """
+        Recalculate every line and the invoice totals in two statements.
+
+        Meant for bulk imports: pending lines are flushed first, then
+        InvoiceItem.recalc_line_totals rewrites them in SQL and a single
+        aggregate reads the new sums back.
+        """
+        session = object_session(self)
+        for item in self.invoice_items:
+            # line_total is NOT NULL, so new lines need a value to be inserted
+            if item.id is None and item.line_total is None:
+                item.calculate_line_total()
+        session.flush()
+        
+        InvoiceItem.recalc_line_totals(session, [self.id])
+        line_total, tax_amount = session.execute(
+            select(
+                func.coalesce(func.sum(InvoiceItem.line_total), 0),
+                func.coalesce(func.sum(InvoiceItem.tax_amount), 0)
+            ).where(InvoiceItem.invoice_id == self.id)
+        ).one()
+        
+        self.subtotal = line_total - tax_amount
+        self.tax_amount = tax_amount
+        self.total_amount = self.subtotal + tax_amount - (self.discount_amount or 0)
+        self.balance_due = self.total_amount - (self.paid_amount or 0)
+    
     @property
     def days_overdue(self):
         """Get number of days overdue."""
@@ -452,13 +624,38 @@ class InvoiceItem(BaseModel):
     def __repr__(self):
         return f"<InvoiceItem(id={self.id}, description='{self.description}', total={self.line_total})>"
     
+    @classmethod
+    def recalc_line_totals(cls, session, invoice_ids):
+        """
+        Recalculate tax and line totals for the given invoices in one UPDATE.
+
+        MySQL's ROUND on DECIMAL rounds half away from zero, so the result
+        matches calculate_line_total. Returns the number of rows matched.
+        """
+        base_amount = func.round(cls.quantity * cls.unit_price, MONEY_PLACES)
+        result = session.execute(
+            update(cls)
+            .where(cls.invoice_id.in_(invoice_ids))
+            .ordered_values(
+                (cls.tax_amount, func.round(base_amount * func.coalesce(cls.tax_rate, 0), MONEY_PLACES)),
+                (cls.line_total, base_amount + cls.tax_amount)
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount
+    
     def calculate_line_total(self):
         """Calculate line total including tax."""
-        base_amount = float(self.quantity) * float(self.unit_price)
+        # Work in cents, thousandths of a unit and ten-thousandths of the rate
+        quantity = to_minor_units(self.quantity, QUANTITY_PLACES)
+        unit_price = to_minor_units(self.unit_price)
+        base_cents = div_round_half_up(quantity * unit_price, 10 ** QUANTITY_PLACES)
         
         if self.tax_rate:
-            self.tax_amount = base_amount * float(self.tax_rate)
-            self.line_total = base_amount + float(self.tax_amount)
+            tax_rate = to_minor_units(self.tax_rate, RATE_PLACES)
+            tax_cents = div_round_half_up(base_cents * tax_rate, 10 ** RATE_PLACES)
         else:
-            self.tax_amount = 0
-            self.line_total = base_amount
+            tax_cents = 0
+        
+        self.tax_amount = from_minor_units(tax_cents)
+        self.line_total = from_minor_units(base_cents + tax_cents)
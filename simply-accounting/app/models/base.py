@@ -2,12 +2,49 @@
 Base model with common fields and functionality.
 """
 
+from typing import Any, Callable, Dict
 from sqlalchemy import Column, Integer, DateTime, Boolean, String
+from sqlalchemy import event, inspect, select, update
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
+# Generated to_dict implementations, keyed by model class
+_dict_serializers: Dict[type, Callable[[Any], dict]] = {}
+
+
+def _build_dict_serializer(cls) -> Callable[[Any], dict]:
+    """
+    Generate a straight-line to_dict for a mapped class.
+
+    Built on first use, once the mapper is configured, so each call is a
+    single dict literal instead of a loop over the table's columns.
+    Deferred columns are only included when already loaded, so serializing
+    never issues a SELECT per row for them; use undefer()/undefer_group()
+    in the query to include them.
+    """
+    column_attrs = cls.__mapper__.column_attrs
+    items = ", ".join(
+        f"{attr.columns[0].name!r}: self.{attr.key}"
+        for attr in column_attrs if not attr.deferred
+    )
+    lines = ["def to_dict(self):", f"    result = {{{items}}}"]
+    deferred_attrs = [attr for attr in column_attrs if attr.deferred]
+    if deferred_attrs:
+        lines.append("    loaded = self.__dict__")
+        for attr in deferred_attrs:
+            lines.append(f"    if {attr.key!r} in loaded:")
+            lines.append(f"        result[{attr.columns[0].name!r}] = loaded[{attr.key!r}]")
+    lines.append("    return result")
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines) + "\n", namespace)
+    serializer = namespace["to_dict"]
+    _dict_serializers[cls] = serializer
+    return serializer
+
+
 class BaseModel(Base):
     """
     Base model class with common fields for all models.
@@ -40,10 +77,10 @@ class BaseModel(Base):
     
     def to_dict(self):
         """Convert model instance to dictionary."""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        serializer = _dict_serializers.get(type(self))
+        if serializer is None:
+            serializer = _build_dict_serializer(type(self))
+        return serializer(self)
     
     def __repr__(self):
         return f"<{self.__class__.__name__}(id={self.id})>"
@@ -67,3 +104,97 @@ class StoreMixin:
     def store_id(cls):
         from sqlalchemy import ForeignKey
         return Column(Integer, ForeignKey('stores.id'), nullable=True, index=True)
+
+
+def track_materialized_path(model, parent_key: str) -> None:
+    """
+    Maintain model.materialized_path ("/1/4/9/") from its parent_key column.
+
+    The path is filled in after insert, once the row has an ID, and
+    rewritten for the row and its whole subtree when the parent changes.
+    """
+    table = model.__table__
+    
+    def parent_path(connection, parent_id):
+        """Get the parent's path, or "/" for a root row."""
+        if parent_id is None:
+            return "/"
+        path = connection.scalar(
+            select(table.c.materialized_path).where(table.c.id == parent_id)
+        )
+        return path or "/"
+    
+    @event.listens_for(model, "after_insert")
+    def set_materialized_path(mapper, connection, target):
+        """Fill in the path once the new row has an ID."""
+        path = f"{parent_path(connection, getattr(target, parent_key))}{target.id}/"
+        connection.execute(
+            update(table)
+            .where(table.c.id == target.id)
+            .values(materialized_path=path)
+        )
+        set_committed_value(target, "materialized_path", path)
+    
+    @event.listens_for(model, "after_update")
+    def move_materialized_path(mapper, connection, target):
+        """Rewrite the paths of a row and its subtree when it is re-parented."""
+        history = getattr(inspect(target).attrs, parent_key).history
+        if not history.has_changes() or not target.materialized_path:
+            return
+        
+        old_path = target.materialized_path
+        new_path = f"{parent_path(connection, getattr(target, parent_key))}{target.id}/"
+        if new_path == old_path:
+            return
+        
+        connection.execute(
+            update(table)
+            .where(table.c.materialized_path.like(f"{old_path}%"))
+            .values(
+                materialized_path=func.concat(
+                    new_path,
+                    func.substring(table.c.materialized_path, len(old_path) + 1)
+                )
+            )
+        )
+        set_committed_value(target, "materialized_path", new_path)
+
+
+def get_item_index(owner, collection: str) -> dict:
+    """
+    Get owner's line items keyed by (product_id, variant_id).
+
+    Built once from the collection and then kept current by the listeners
+    track_item_index() registers, so repeated lookups skip a linear scan.
+    """
+    index = owner.__dict__.get("_item_index")
+    if index is None:
+        index = {}
+        for item in getattr(owner, collection):
+            index.setdefault((item.product_id, item.variant_id), item)
+        owner.__dict__["_item_index"] = index
+    return index
+
+
+def _forget_item_index(target, *args):
+    """Drop the item index so get_item_index() rebuilds it on next use."""
+    target.__dict__.pop("_item_index", None)
+
+
+def track_item_index(model, collection: str) -> None:
+    """
+    Keep get_item_index() current for model's line item collection.
+
+    Appended items are added to a built index; removals, expiry and
+    refresh drop it.
+    """
+    @event.listens_for(getattr(model, collection), "append")
+    def index_appended_item(target, value, initiator):
+        """Add a newly appended item to the index, if built."""
+        index = target.__dict__.get("_item_index")
+        if index is not None:
+            index.setdefault((value.product_id, value.variant_id), value)
+    
+    event.listen(getattr(model, collection), "remove", _forget_item_index)
+    event.listen(model, "expire", _forget_item_index)
+    event.listen(model, "refresh", _forget_item_index)
@@ -2,12 +2,39 @@
 Customer management models.
 """
 
+import json
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import cached_property
 from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, DateTime, Date, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Computed, and_, case, event, literal, not_, or_, select, update
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred, object_session, relationship
 from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import Grouping
+from app.core.money import from_minor_units, to_minor_units
 from app.models.base import BaseModel, TenantMixin
 
 
+# Loyalty tiers in ascending order; a customer reaches LOYALTY_TIERS[i + 1]
+# at LOYALTY_TIER_THRESHOLDS[i] points
+LOYALTY_TIER_THRESHOLDS = (1000, 5000, 10000)
+LOYALTY_TIERS = ("bronze", "silver", "gold", "platinum")
+
+# Cached Customer properties and the columns each one is built from
+_CACHED_PROPERTY_SOURCES = {
+    "display_name": ("first_name", "last_name", "company_name"),
+    "billing_address": (
+        "billing_address_line1", "billing_address_line2", "billing_city",
+        "billing_state", "billing_postal_code", "billing_country"
+    ),
+    "shipping_address": (
+        "shipping_address_line1", "shipping_address_line2", "shipping_city",
+        "shipping_state", "shipping_postal_code", "shipping_country"
+    ),
+}
+
+
 class Customer(BaseModel, TenantMixin):
     """
     Customer model for managing customer information and relationships.
@@ -20,25 +47,39 @@ class Customer(BaseModel, TenantMixin):
     last_name = Column(String(100), nullable=False)
     company_name = Column(String(255), nullable=True)
     
+    # Maintained by MySQL on write; query it through Customer.full_name
+    stored_full_name = Column(
+        "full_name",
+        String(460),
+        Computed(
+            "CASE WHEN company_name <> '' "
+            "THEN CONCAT(first_name, ' ', last_name, ' (', company_name, ')') "
+            "ELSE TRIM(CONCAT(first_name, ' ', last_name)) END",
+            persisted=True
+        ),
+        index=True
+    )
+    
     # Contact Information
     email = Column(String(255), nullable=True, index=True)
     phone = Column(String(50), nullable=True)
     mobile = Column(String(50), nullable=True)
     
-    # Address Information
-    billing_address_line1 = Column(String(255), nullable=True)
-    billing_address_line2 = Column(String(255), nullable=True)
-    billing_city = Column(String(100), nullable=True)
-    billing_state = Column(String(100), nullable=True)
-    billing_postal_code = Column(String(20), nullable=True)
-    billing_country = Column(String(100), nullable=True)
-    
-    shipping_address_line1 = Column(String(255), nullable=True)
-    shipping_address_line2 = Column(String(255), nullable=True)
-    shipping_city = Column(String(100), nullable=True)
-    shipping_state = Column(String(100), nullable=True)
-    shipping_postal_code = Column(String(20), nullable=True)
-    shipping_country = Column(String(100), nullable=True)
+    # Address Information (deferred with notes/tags/custom fields in the
+    # "detail" group; list queries skip them, undefer_group("detail") loads them)
+    billing_address_line1 = deferred(Column(String(255), nullable=True), group="detail")
+    billing_address_line2 = deferred(Column(String(255), nullable=True), group="detail")
+    billing_city = deferred(Column(String(100), nullable=True), group="detail")
+    billing_state = deferred(Column(String(100), nullable=True), group="detail")
+    billing_postal_code = deferred(Column(String(20), nullable=True), group="detail")
+    billing_country = deferred(Column(String(100), nullable=True), group="detail")
+    
+    shipping_address_line1 = deferred(Column(String(255), nullable=True), group="detail")
+    shipping_address_line2 = deferred(Column(String(255), nullable=True), group="detail")
+    shipping_city = deferred(Column(String(100), nullable=True), group="detail")
+    shipping_state = deferred(Column(String(100), nullable=True), group="detail")
+    shipping_postal_code = deferred(Column(String(20), nullable=True), group="detail")
+    shipping_country = deferred(Column(String(100), nullable=True), group="detail")
     
     # Customer Details
     date_of_birth = Column(Date, nullable=True)
@@ -49,6 +90,7 @@ class Customer(BaseModel, TenantMixin):
     credit_limit = Column(Numeric(10, 2), default=0, nullable=False)
     current_balance = Column(Numeric(10, 2), default=0, nullable=False)  # Outstanding balance
     total_spent = Column(Numeric(10, 2), default=0, nullable=False)  # Lifetime value
+    sales_count = Column(Integer, default=0, nullable=False)  # Maintained by update_purchase_history
     
     # Loyalty Program
     loyalty_points = Column(Integer, default=0, nullable=False)
@@ -69,56 +111,64 @@ class Customer(BaseModel, TenantMixin):
     last_purchase_date = Column(DateTime(timezone=True), nullable=True)
     
     # Additional Data
-    notes = Column(Text, nullable=True)
-    tags = Column(JSON, nullable=True)  # Customer tags
-    custom_fields = Column(JSON, nullable=True)  # Custom fields
+    notes = deferred(Column(Text, nullable=True), group="detail")
+    tags = deferred(Column(JSON, nullable=True), group="detail")  # Customer tags
+    custom_fields = deferred(Column(JSON, nullable=True), group="detail")  # Custom fields
     
     # Relationships
     tenant = relationship("Tenant", back_populates="customers")
-    sales = relationship("Sale", back_populates="customer")
+    # Load with selectinload(Customer.sales); a lazy load here would be one
+    # query per customer, so it raises instead
+    sales = relationship("Sale", back_populates="customer", lazy="raise_on_sql")
     
     def __repr__(self):
-        return f"<Customer(id={self.id}, name='{self.full_name}', number='{self.customer_number}')>"
+        # Read loaded state directly so repr never triggers a lazy load
+        d = self.__dict__
+        return "<Customer(id=%s, name='%s', number='%s')>" % (
+            d.get("id"), d.get("stored_full_name"), d.get("customer_number")
+        )
     
-    @property
+    @hybrid_property
     def full_name(self):
         """Get customer's full name."""
         if self.company_name:
             return f"{self.first_name} {self.last_name} ({self.company_name})"
         return f"{self.first_name} {self.last_name}".strip()
     
-    @property
+    @full_name.expression
+    def full_name(cls):
+        return cls.stored_full_name
+    
+    @cached_property
     def display_name(self):
         """Get display name for customer."""
         if self.company_name:
             return self.company_name
         return self.full_name
     
-    @property
+    @cached_property
     def billing_address(self):
         """Get formatted billing address."""
-        address_parts = [
+        return ", ".join(part for part in (
             self.billing_address_line1,
             self.billing_address_line2,
             self.billing_city,
             self.billing_state,
             self.billing_postal_code,
             self.billing_country
-        ]
-        return ", ".join([part for part in address_parts if part])
+        ) if part)
     
-    @property
+    @cached_property
     def shipping_address(self):
         """Get formatted shipping address."""
-        address_parts = [
+        return ", ".join(part for part in (
             self.shipping_address_line1,
             self.shipping_address_line2,
             self.shipping_city,
             self.shipping_state,
             self.shipping_postal_code,
             self.shipping_country
-        ]
-        return ", ".join([part for part in address_parts if part])
+        ) if part)
     
     @property
     def has_outstanding_balance(self):
@@ -150,14 +200,96 @@ class Customer(BaseModel, TenantMixin):
     
     def update_loyalty_tier(self):
         """Update loyalty tier based on points."""
-        if self.loyalty_points >= 10000:
-            self.loyalty_tier = "platinum"
-        elif self.loyalty_points >= 5000:
-            self.loyalty_tier = "gold"
-        elif self.loyalty_points >= 1000:
-            self.loyalty_tier = "silver"
-        else:
-            self.loyalty_tier = "bronze"
+        self.loyalty_tier = LOYALTY_TIERS[bisect_right(LOYALTY_TIER_THRESHOLDS, self.loyalty_points)]
+    
+    @classmethod
+    def _loyalty_tier_case(cls):
+        """SQL expression mapping loyalty_points to its tier name."""
+        return case(
+            *(
+                (cls.loyalty_points >= threshold, name)
+                for threshold, name in reversed(list(zip(LOYALTY_TIER_THRESHOLDS, LOYALTY_TIERS[1:])))
+            ),
+            else_=LOYALTY_TIERS[0]
+        )
+    
+    @classmethod
+    def bulk_recalc_tiers(cls, session, tenant_id: int):
+        """Recalculate loyalty tiers for all of a tenant's customers in one UPDATE."""
+        session.execute(
+            update(cls)
+            .where(cls.tenant_id == tenant_id)
+            .values(loyalty_tier=cls._loyalty_tier_case())
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def backfill_sales_count(cls, session, tenant_id: int = None):
+        """
+        Recompute sales_count from the sales table with one UPDATE.
+
+        A one-off for customers whose sales predate the column, or to repair
+        drift. Counts sales that went through complete_sale(), including
+        ones since refunded, as update_purchase_history() does.
+        """
+        from app.models.sale import Sale, SaleStatus
+        
+        stmt = update(cls).values(
+            sales_count=(
+                select(func.count(Sale.id))
+                .where(
+                    Sale.customer_id == cls.id,
+                    Sale.status.in_((
+                        SaleStatus.COMPLETED, SaleStatus.REFUNDED, SaleStatus.PARTIALLY_REFUNDED
+                    ))
+                )
+                .correlate(cls)
+                .scalar_subquery()
+            )
+        )
+        if tenant_id is not None:
+            stmt = stmt.where(cls.tenant_id == tenant_id)
+        session.execute(stmt.execution_options(synchronize_session=False))
+    
+    @classmethod
+    def batch_apply_loyalty(cls, session, tenant_id: int, since, until=None):
+        """
+        Credit loyalty points earned by completed sales in one UPDATE.
+
+        Sums loyalty_points_earned per customer over sales completed at or
+        after since (and before until, if given), adds it to each customer's
+        points and moves them to the matching tier. Meant for end-of-shift
+        runs; sales in the window must have been completed with
+        apply_loyalty=False so their points are not credited twice.
+        """
+        from app.models.sale import Sale, SaleStatus
+        
+        conditions = [
+            Sale.tenant_id == tenant_id,
+            Sale.status == SaleStatus.COMPLETED,
+            Sale.sale_date >= since,
+            Sale.loyalty_points_earned > 0
+        ]
+        if until is not None:
+            conditions.append(Sale.sale_date < until)
+        
+        earned = (
+            select(func.sum(Sale.loyalty_points_earned))
+            .where(Sale.customer_id == cls.id, *conditions)
+            .correlate_except(Sale)
+            .scalar_subquery()
+        )
+        # MySQL applies single-table SET clauses in order, so the tier is
+        # computed from the updated points
+        session.execute(
+            update(cls)
+            .where(cls.tenant_id == tenant_id, cls.id.in_(select(Sale.customer_id).where(*conditions)))
+            .ordered_values(
+                (cls.loyalty_points, cls.loyalty_points + earned),
+                (cls.loyalty_tier, cls._loyalty_tier_case())
+            )
+            .execution_options(synchronize_session=False)
+        )
     
     def calculate_loyalty_points(self, purchase_amount: float, rate: float = 0.01):
         """Calculate loyalty points for a purchase."""
@@ -169,20 +301,45 @@ class Customer(BaseModel, TenantMixin):
             sale_date = func.now()
         
         # Update totals
-        self.total_spent += sale_amount
+        self.total_spent = from_minor_units(
+            to_minor_units(self.total_spent) + to_minor_units(sale_amount)
+        )
+        self.sales_count = (self.sales_count or 0) + 1
         self.last_purchase_date = sale_date
         
         # Set first purchase date if not set
         if self.first_purchase_date is None:
             self.first_purchase_date = sale_date
     
+    @hybrid_property
+    def average_order_value(self):
+        """Get average total of this customer's active sales."""
+        if "sales" in self.__dict__ or object_session(self) is None:
+            active_sales = [sale for sale in self.sales if sale.is_active]
+            if not active_sales:
+                return 0
+            return sum(sale.total_amount for sale in active_sales) / len(active_sales)
+        return object_session(self).scalar(
+            select(Customer.average_order_value).where(Customer.id == self.id)
+        )
+    
+    @average_order_value.expression
+    def average_order_value(cls):
+        from app.models.sale import Sale
+        return (
+            select(func.coalesce(func.avg(Sale.total_amount), 0))
+            .where(Sale.customer_id == cls.id, Sale.is_active == True)
+            .correlate_except(Sale)
+            .scalar_subquery()
+        )
+    
     def get_purchase_frequency(self):
         """Calculate average days between purchases."""
         if not self.first_purchase_date or not self.last_purchase_date:
             return None
         
         # Get total number of sales
-        total_sales = len(self.sales)
+        total_sales = self.sales_count
         if total_sales <= 1:
             return None
         
@@ -194,23 +351,70 @@ class Customer(BaseModel, TenantMixin):
     
     def get_average_order_value(self):
         """Calculate average order value."""
-        if not self.sales:
-            return 0
+        return self.average_order_value
+    
+    def _json_update(self, attribute: str, value_expression, *conditions) -> bool:
+        """
+        Rewrite a JSON column in the database without reading it first.
+
+        Returns False for detached customers so callers can fall back to
+        changing the value in memory.
+        """
+        session = object_session(self)
+        if session is None or self.id is None:
+            return False
         
-        total_amount = sum(sale.total_amount for sale in self.sales if sale.is_active)
-        return total_amount / len([s for s in self.sales if s.is_active])
+        column = getattr(Customer, attribute)
+        session.execute(
+            update(Customer)
+            .where(Customer.id == self.id, *conditions)
+            .values({column: value_expression})
+            .execution_options(synchronize_session=False)
+        )
+        session.expire(self, [attribute])
+        return True
+    
+    @classmethod
+    def has_tag(cls, tag: str):
+        """
+        Filter condition for customers carrying a tag.
+
+        Written as MEMBER OF so MySQL can answer it from ix_customers_tags.
+        """
+        return literal(tag).op("MEMBER OF")(Grouping(cls.tags))
     
     def add_tag(self, tag: str):
         """Add a tag to the customer."""
+        if self._json_update(
+            "tags",
+            func.json_array_append(func.coalesce(Customer.tags, func.json_array()), "$", tag),
+            or_(Customer.tags.is_(None), not_(Customer.has_tag(tag)))
+        ):
+            return
+        
         if not self.tags:
             self.tags = []
         if tag not in self.tags:
-            self.tags.append(tag)
+            self.tags = self.tags + [tag]
     
     def remove_tag(self, tag: str):
         """Remove a tag from the customer."""
+        # JSON_SEARCH matches LIKE patterns, so escape the wildcards
+        pattern = tag.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        if self._json_update(
+            "tags",
+            func.json_remove(
+                Customer.tags,
+                func.json_unquote(func.json_search(Customer.tags, "one", pattern, "\\"))
+            ),
+            Customer.has_tag(tag)
+        ):
+            return
+        
         if self.tags and tag in self.tags:
-            self.tags.remove(tag)
+            tags = list(self.tags)
+            tags.remove(tag)
+            self.tags = tags
     
     def get_custom_field(self, key: str, default=None):
         """Get a custom field value."""
@@ -220,9 +424,17 @@ class Customer(BaseModel, TenantMixin):
     
     def set_custom_field(self, key: str, value):
         """Set a custom field value."""
-        if not self.custom_fields:
-            self.custom_fields = {}
-        self.custom_fields[key] = value
+        if self._json_update(
+            "custom_fields",
+            func.json_set(
+                func.coalesce(Customer.custom_fields, func.json_object()),
+                f"$.{json.dumps(key)}",
+                func.json_extract(json.dumps(value), "$")
+            )
+        ):
+            return
+        
+        self.custom_fields = {**(self.custom_fields or {}), key: value}
     
     def block_customer(self, reason: str):
         """Block customer with reason."""
@@ -246,6 +458,41 @@ class Customer(BaseModel, TenantMixin):
         self.shipping_country = self.billing_country
 
 
+def _forget_cached_properties(target, *args):
+    """Drop every cached Customer property when the row is expired or refreshed."""
+    for name in _CACHED_PROPERTY_SOURCES:
+        target.__dict__.pop(name, None)
+
+
+event.listen(Customer, "expire", _forget_cached_properties)
+event.listen(Customer, "refresh", _forget_cached_properties)
+
+
+def _forget_cached_property(name: str):
+    """Build a set listener that drops one cached Customer property."""
+    def listener(target, value, oldvalue, initiator):
+        target.__dict__.pop(name, None)
+    return listener
+
+
+for _name, _columns in _CACHED_PROPERTY_SOURCES.items():
+    _listener = _forget_cached_property(_name)
+    for _column in _columns:
+        event.listen(getattr(Customer, _column), "set", _listener)
+
+
+# Multi-valued index over the tag array (MySQL 8.0.17+). SQLAlchemy cannot
+# express CAST(... ARRAY) key parts, so it is created with raw DDL.
+event.listen(
+    Customer.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_customers_tags ON customers "
+        "((CAST(tags AS CHAR(100) ARRAY)))"
+    ).execute_if(dialect="mysql")
+)
+
+
 class CustomerGroup(BaseModel, TenantMixin):
     """
     Customer group model for organizing customers and applying group-specific pricing.
@@ -303,14 +550,25 @@ class CustomerNote(BaseModel):
     def __repr__(self):
         return f"<CustomerNote(id={self.id}, customer_id={self.customer_id}, type='{self.note_type}')>"
     
-    @property
+    @hybrid_property
     def is_overdue(self):
         """Check if follow-up is overdue."""
         if not self.follow_up_date or self.is_completed:
             return False
         
-        from datetime import datetime
-        return datetime.utcnow() > self.follow_up_date
+        now = datetime.now(timezone.utc)
+        if self.follow_up_date.tzinfo is None:
+            # MySQL DATETIME values come back naive, in UTC
+            now = now.replace(tzinfo=None)
+        return now > self.follow_up_date
+    
+    @is_overdue.expression
+    def is_overdue(cls):
+        return and_(
+            cls.follow_up_date.isnot(None),
+            cls.is_completed == False,
+            cls.follow_up_date < func.utc_timestamp()
+        )
     
     def mark_completed(self):
         """Mark follow-up as completed."""
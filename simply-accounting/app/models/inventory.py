@@ -3,12 +3,42 @@ Inventory management models.
 """
 
 from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, DateTime, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Computed, Index, UniqueConstraint, case, event, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import object_session, relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
+from app.core.money import (
+    QUANTITY_PLACES,
+    UNIT_COST_PLACES,
+    div_round_half_up,
+    from_minor_units,
+    to_minor_units
+)
 from app.models.base import BaseModel, TenantMixin, StoreMixin
 
 
+def _extended_cost(quantity, unit_cost):
+    """Exact quantity * unit cost, computed in integer minor units."""
+    return from_minor_units(
+        to_minor_units(quantity, QUANTITY_PLACES) * to_minor_units(unit_cost, UNIT_COST_PLACES),
+        QUANTITY_PLACES + UNIT_COST_PLACES
+    )
+
+
+def _add_quantities(quantity, delta):
+    """Exact quantity + delta, computed in integer thousandths."""
+    return from_minor_units(
+        to_minor_units(quantity, QUANTITY_PLACES) + to_minor_units(delta, QUANTITY_PLACES),
+        QUANTITY_PLACES
+    )
+
+
+BULK_UPSERT_PAGE_SIZE = 10_000
+
+
 class MovementType(PyEnum):
     """Enumeration for stock movement types."""
     SALE = "sale"
@@ -22,15 +52,59 @@ class MovementType(PyEnum):
     INITIAL = "initial"
 
 
+_MOVEMENT_DESCRIPTIONS = {
+    MovementType.SALE: "Sale",
+    MovementType.PURCHASE: "Purchase",
+    MovementType.ADJUSTMENT: "Stock Adjustment",
+    MovementType.TRANSFER_IN: "Transfer In",
+    MovementType.TRANSFER_OUT: "Transfer Out",
+    MovementType.RETURN: "Return",
+    MovementType.DAMAGE: "Damaged Stock",
+    MovementType.EXPIRED: "Expired Stock",
+    MovementType.INITIAL: "Initial Stock"
+}
+
+
 class InventoryItem(BaseModel, TenantMixin, StoreMixin):
     """
     Inventory item model tracking stock levels for products/variants in stores.
     """
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        # One row per tenant, store, product, variant and lot; also the
+        # conflict target for bulk_upsert(). Built on the NOT NULL key
+        # columns because MySQL never treats NULLs in a unique key as equal.
+        UniqueConstraint(
+            "tenant_id", "store_key", "product_id", "variant_key", "lot_key",
+            name="uq_inventory_items_stock_key"
+        ),
+        # MySQL has no partial indexes; carrying both quantities lets the
+        # low-stock comparison be checked from the index alone.
+        Index(
+            "ix_inventory_items_low_stock",
+            "tenant_id", "store_id", "quantity_available", "reorder_point"
+        ),
+        # Stock lookups by product or variant; again no partial indexes, so
+        # the soft-delete flags and quantity are carried to cover the SUM
+        Index(
+            "ix_inventory_items_product_active",
+            "product_id", "store_id", "is_active", "is_deleted", "quantity_on_hand"
+        ),
+        Index(
+            "ix_inventory_items_variant_active",
+            "variant_id", "store_id", "is_active", "is_deleted", "quantity_on_hand"
+        ),
+        # Store low-stock listings, ordered by quantity on hand (InnoDB
+        # appends the primary key, which keeps pagination stable)
+        Index(
+            "ix_inventory_items_store_on_hand",
+            "store_id", "is_active", "is_deleted", "quantity_on_hand"
+        ),
+    )
     
     # Product References
-    product_id = Column(ForeignKey("products.id"), nullable=False, index=True)
-    variant_id = Column(ForeignKey("product_variants.id"), nullable=True, index=True)
+    product_id = Column(ForeignKey("products.id"), nullable=False)
+    variant_id = Column(ForeignKey("product_variants.id"), nullable=True)
     
     # Stock Levels
     quantity_on_hand = Column(Numeric(10, 3), default=0, nullable=False)
@@ -53,6 +127,12 @@ class InventoryItem(BaseModel, TenantMixin, StoreMixin):
     lot_number = Column(String(100), nullable=True, index=True)
     expiry_date = Column(DateTime(timezone=True), nullable=True)
     
+    # Stock key, maintained by MySQL on write: store, variant and lot with
+    # NULL mapped to 0 or '' so the unique key can match them
+    store_key = Column(Integer, Computed("COALESCE(store_id, 0)", persisted=True), nullable=False)
+    variant_key = Column(Integer, Computed("COALESCE(variant_id, 0)", persisted=True), nullable=False)
+    lot_key = Column(String(100), Computed("COALESCE(lot_number, '')", persisted=True), nullable=False)
+    
     # Relationships
     tenant = relationship("Tenant")
     store = relationship("Store", back_populates="inventory_items")
@@ -61,7 +141,11 @@ class InventoryItem(BaseModel, TenantMixin, StoreMixin):
     stock_movements = relationship("StockMovement", back_populates="inventory_item", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<InventoryItem(id={self.id}, product_id={self.product_id}, store_id={self.store_id}, qty={self.quantity_on_hand})>"
+        # Read loaded state directly so repr never triggers a lazy load
+        d = self.__dict__
+        return "<InventoryItem(id=%s, product_id=%s, store_id=%s, qty=%s)>" % (
+            d.get("id"), d.get("product_id"), d.get("store_id"), d.get("quantity_on_hand")
+        )
     
     @property
     def is_low_stock(self):
@@ -87,7 +171,75 @@ class InventoryItem(BaseModel, TenantMixin, StoreMixin):
         """Calculate total inventory value."""
         if self.unit_cost is None:
             return 0
-        return float(self.quantity_on_hand) * float(self.unit_cost)
+        return _extended_cost(self.quantity_on_hand, self.unit_cost)
+    
+    @classmethod
+    def report_total_value(cls, session, tenant_id: int, store_id: int = None):
+        """
+        Total value of active inventory, summed by the database.
+
+        The DECIMAL products are added up in one aggregate query, so no
+        rows are loaded and the result stays exact.
+        """
+        stmt = select(func.coalesce(func.sum(cls.quantity_on_hand * cls.unit_cost), 0)).where(
+            cls.tenant_id == tenant_id,
+            cls.is_active.is_(True),
+            cls.is_deleted.is_(False)
+        )
+        if store_id is not None:
+            stmt = stmt.where(cls.store_id == store_id)
+        return session.execute(stmt).scalar()
+    
+    @classmethod
+    def bulk_upsert(cls, session, rows, page_size: int = BULK_UPSERT_PAGE_SIZE):
+        """
+        Insert inventory rows, adding to the stock of rows that already exist.
+
+        Each row is a dict of column values with at least tenant_id,
+        store_id, product_id, variant_id and quantity_on_hand, and
+        optionally lot_number. Rows that hit an existing tenant, store,
+        product, variant and lot add their quantity to it and replace
+        last_cost; a missing store, variant or lot matches the existing row
+        that also has none. Rows are sent as multi-row
+        INSERT ... ON DUPLICATE KEY UPDATE statements of page_size rows.
+        """
+        rows = [{"quantity_available": row["quantity_on_hand"], "lot_number": None, **row} for row in rows]
+        for start in range(0, len(rows), page_size):
+            stmt = mysql_insert(cls).values(rows[start:start + page_size])
+            stmt = stmt.on_duplicate_key_update(
+                quantity_on_hand=cls.quantity_on_hand + stmt.inserted.quantity_on_hand,
+                quantity_available=cls.quantity_available + stmt.inserted.quantity_on_hand,
+                last_cost=func.coalesce(stmt.inserted.last_cost, cls.last_cost),
+                updated_at=func.now()
+            )
+            session.execute(stmt)
+    
+    @classmethod
+    def write_stock_levels(cls, session, inventory_items):
+        """
+        Write the in-memory stock and cost columns of many items with one UPDATE.
+
+        The written values become the items' committed state, so the unit
+        of work does not issue a second UPDATE per item on flush.
+        """
+        columns = ("quantity_on_hand", "quantity_available", "unit_cost", "last_cost")
+        inventory_items = {inventory_item.id: inventory_item for inventory_item in inventory_items}
+        session.execute(
+            update(cls)
+            .where(cls.id.in_(inventory_items))
+            .values({
+                column: case(
+                    {item_id: getattr(item, column) for item_id, item in inventory_items.items()},
+                    value=cls.id
+                )
+                for column in columns
+            })
+            .execution_options(synchronize_session=False)
+        )
+        
+        for inventory_item in inventory_items.values():
+            for column in columns:
+                set_committed_value(inventory_item, column, getattr(inventory_item, column))
     
     def update_available_quantity(self):
         """Update available quantity based on on-hand and reserved."""
@@ -98,7 +250,7 @@ class InventoryItem(BaseModel, TenantMixin, StoreMixin):
         if quantity > self.quantity_available:
             raise ValueError("Cannot reserve more than available quantity")
         
-        self.quantity_reserved += quantity
+        self.quantity_reserved = _add_quantities(self.quantity_reserved, quantity)
         self.update_available_quantity()
     
     def release_reservation(self, quantity: float):
@@ -106,7 +258,7 @@ class InventoryItem(BaseModel, TenantMixin, StoreMixin):
         if quantity > self.quantity_reserved:
             raise ValueError("Cannot release more than reserved quantity")
         
-        self.quantity_reserved -= quantity
+        self.quantity_reserved = _add_quantities(self.quantity_reserved, -quantity)
         self.update_available_quantity()
     
     def adjust_quantity(self, new_quantity: float, reason: str = "Manual adjustment"):
@@ -138,24 +290,62 @@ class InventoryItem(BaseModel, TenantMixin, StoreMixin):
         if self.unit_cost is None or self.quantity_on_hand == 0:
             self.unit_cost = new_cost
         else:
-            # Weighted average cost
-            total_value = (float(self.quantity_on_hand) * float(self.unit_cost)) + (quantity * new_cost)
-            total_quantity = float(self.quantity_on_hand) + quantity
+            # Weighted average cost, in thousandths of a unit and
+            # ten-thousandths of a currency unit
+            on_hand = to_minor_units(self.quantity_on_hand, QUANTITY_PLACES)
+            received = to_minor_units(quantity, QUANTITY_PLACES)
+            total_value = (
+                on_hand * to_minor_units(self.unit_cost, UNIT_COST_PLACES)
+                + received * to_minor_units(new_cost, UNIT_COST_PLACES)
+            )
+            total_quantity = on_hand + received
             
             if total_quantity > 0:
-                self.unit_cost = total_value / total_quantity
+                self.unit_cost = from_minor_units(
+                    div_round_half_up(total_value, total_quantity), UNIT_COST_PLACES
+                )
         
         self.last_cost = new_cost
 
 
+# Keep products.total_stock equal to the summed on-hand quantity of the
+# product's active inventory items. Triggers rather than ORM events, because
+# the bulk UPDATE and upsert paths above never go through the unit of work.
+_STOCK_ROW_FILTER = "{row}.is_active AND NOT {row}.is_deleted"
+
+for _ddl in (
+    "CREATE TRIGGER trg_inventory_items_stock_ai AFTER INSERT ON inventory_items "
+    "FOR EACH ROW "
+    "UPDATE products SET total_stock = total_stock + NEW.quantity_on_hand "
+    f"WHERE id = NEW.product_id AND {_STOCK_ROW_FILTER.format(row='NEW')}",
+    
+    "CREATE TRIGGER trg_inventory_items_stock_au AFTER UPDATE ON inventory_items "
+    "FOR EACH ROW BEGIN "
+    "UPDATE products SET total_stock = total_stock - OLD.quantity_on_hand "
+    f"WHERE id = OLD.product_id AND {_STOCK_ROW_FILTER.format(row='OLD')}; "
+    "UPDATE products SET total_stock = total_stock + NEW.quantity_on_hand "
+    f"WHERE id = NEW.product_id AND {_STOCK_ROW_FILTER.format(row='NEW')}; "
+    "END",
+    
+    "CREATE TRIGGER trg_inventory_items_stock_ad AFTER DELETE ON inventory_items "
+    "FOR EACH ROW "
+    "UPDATE products SET total_stock = total_stock - OLD.quantity_on_hand "
+    f"WHERE id = OLD.product_id AND {_STOCK_ROW_FILTER.format(row='OLD')}",
+):
+    event.listen(InventoryItem.__table__, "after_create", DDL(_ddl).execute_if(dialect="mysql"))
+
+
 class StockMovement(BaseModel, TenantMixin, StoreMixin):
     """
     Stock movement model for tracking all inventory changes.
     """
     __tablename__ = "stock_movements"
+    __table_args__ = (
+        Index("ix_stock_movements_item_created", "inventory_item_id", "created_at"),
+    )
     
     # References
-    inventory_item_id = Column(ForeignKey("inventory_items.id"), nullable=False, index=True)
+    inventory_item_id = Column(ForeignKey("inventory_items.id"), nullable=False)
     product_id = Column(ForeignKey("products.id"), nullable=False, index=True)
     variant_id = Column(ForeignKey("product_variants.id"), nullable=True, index=True)
     
@@ -186,14 +376,17 @@ class StockMovement(BaseModel, TenantMixin, StoreMixin):
     variant = relationship("ProductVariant")
     
     def __repr__(self):
-        return f"<StockMovement(id={self.id}, type={self.movement_type}, qty={self.quantity})>"
+        d = self.__dict__
+        return "<StockMovement(id=%s, type=%s, qty=%s)>" % (
+            d.get("id"), d.get("movement_type"), d.get("quantity")
+        )
     
     @property
     def total_value(self):
         """Calculate total value of the movement."""
         if self.unit_cost is None:
             return 0
-        return float(self.quantity) * float(self.unit_cost)
+        return _extended_cost(self.quantity, self.unit_cost)
     
     @property
     def is_inbound(self):
@@ -207,18 +400,30 @@ class StockMovement(BaseModel, TenantMixin, StoreMixin):
     
     def get_movement_description(self):
         """Get human-readable movement description."""
-        descriptions = {
-            MovementType.SALE: "Sale",
-            MovementType.PURCHASE: "Purchase",
-            MovementType.ADJUSTMENT: "Stock Adjustment",
-            MovementType.TRANSFER_IN: "Transfer In",
-            MovementType.TRANSFER_OUT: "Transfer Out",
-            MovementType.RETURN: "Return",
-            MovementType.DAMAGE: "Damaged Stock",
-            MovementType.EXPIRED: "Expired Stock",
-            MovementType.INITIAL: "Initial Stock"
-        }
-        return descriptions.get(self.movement_type, str(self.movement_type))
+        return _MOVEMENT_DESCRIPTIONS.get(self.movement_type, str(self.movement_type))
+    
+    @classmethod
+    def insert_for_reference(cls, session, movements):
+        """
+        Write movement rows for one document with a single multi-row INSERT.
+
+        Every row must share the same reference_type and reference_id. MySQL
+        has no RETURNING, so the new rows are read back with one SELECT on
+        that reference and returned as persistent StockMovement objects.
+        """
+        if not movements:
+            return []
+        
+        session.execute(insert(cls), movements)
+        return session.execute(
+            select(cls)
+            .where(
+                cls.inventory_item_id.in_({movement["inventory_item_id"] for movement in movements}),
+                cls.reference_type == movements[0]["reference_type"],
+                cls.reference_id == movements[0]["reference_id"]
+            )
+            .order_by(cls.id)
+        ).scalars().all()
 
 
 class StockAdjustment(BaseModel, TenantMixin, StoreMixin):
@@ -253,22 +458,68 @@ class StockAdjustment(BaseModel, TenantMixin, StoreMixin):
     def __repr__(self):
         return f"<StockAdjustment(id={self.id}, number='{self.adjustment_number}', status='{self.status}')>"
     
-    @property
+    @hybrid_property
     def total_items(self):
         """Get total number of items in adjustment."""
-        return len(self.adjustment_items)
+        if "adjustment_items" in self.__dict__ or object_session(self) is None:
+            return len(self.adjustment_items)
+        return object_session(self).scalar(
+            select(StockAdjustment.total_items).where(StockAdjustment.id == self.id)
+        )
     
-    @property
+    @total_items.expression
+    def total_items(cls):
+        return (
+            select(func.count(StockAdjustmentItem.id))
+            .where(StockAdjustmentItem.adjustment_id == cls.id)
+            .correlate_except(StockAdjustmentItem)
+            .scalar_subquery()
+        )
+    
+    @hybrid_property
     def total_value_impact(self):
         """Calculate total value impact of adjustment."""
-        total = 0
-        for item in self.adjustment_items:
-            total += item.value_impact
-        return total
+        if "adjustment_items" in self.__dict__ or object_session(self) is None:
+            total = 0
+            for item in self.adjustment_items:
+                total += item.value_impact
+            return total
+        return object_session(self).scalar(
+            select(StockAdjustment.total_value_impact).where(StockAdjustment.id == self.id)
+        )
+    
+    @total_value_impact.expression
+    def total_value_impact(cls):
+        return (
+            select(func.coalesce(func.sum(
+                StockAdjustmentItem.unit_cost
+                * (StockAdjustmentItem.new_quantity - StockAdjustmentItem.current_quantity)
+            ), 0))
+            .where(StockAdjustmentItem.adjustment_id == cls.id)
+            .correlate_except(StockAdjustmentItem)
+            .scalar_subquery()
+        )
+    
+    @classmethod
+    def load_for_apply(cls, session, adjustment_id: int):
+        """
+        Load an adjustment with its items and their inventory items.
+
+        Uses two IN queries for the whole tree, so apply() runs without any
+        per-item lazy loads.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id == adjustment_id)
+            .options(
+                selectinload(cls.adjustment_items)
+                .selectinload(StockAdjustmentItem.inventory_item)
+            )
+        ).scalars().first()
     
     def can_be_approved(self):
         """Check if adjustment can be approved."""
-        return self.status == "draft" and len(self.adjustment_items) > 0
+        return self.status == "draft" and self.total_items > 0
     
     def can_be_applied(self):
         """Check if adjustment can be applied."""
@@ -284,20 +535,42 @@ class StockAdjustment(BaseModel, TenantMixin, StoreMixin):
         self.approved_at = func.now()
     
     def apply(self, user_id: int):
-        """Apply the adjustment to inventory."""
+        """
+        Apply the adjustment to inventory.
+
+        Returns the adjustment's StockMovement objects. Inside a session the
+        inventory quantities are set with a single UPDATE and the movements
+        are already written, with a single multi-row INSERT; detached
+        adjustments return them unsaved.
+        """
         if not self.can_be_applied():
             raise ValueError("Adjustment cannot be applied")
         
+        session = object_session(self)
+        if session is not None and not all(
+            "inventory_item" in item.__dict__ for item in self.adjustment_items
+        ):
+            # Load every inventory item in one query so item.inventory_item
+            # below is an identity map hit instead of a lazy load per line
+            inventory_item_ids = [item.inventory_item_id for item in self.adjustment_items]
+            session.execute(
+                select(InventoryItem).where(InventoryItem.id.in_(inventory_item_ids))
+            ).scalars().all()
+        
         movements = []
+        new_quantities = {}
         for item in self.adjustment_items:
             # Update inventory
             inventory_item = item.inventory_item
             old_quantity = inventory_item.quantity_on_hand
-            inventory_item.quantity_on_hand = item.new_quantity
-            inventory_item.update_available_quantity()
+            if session is None:
+                inventory_item.quantity_on_hand = item.new_quantity
+                inventory_item.update_available_quantity()
+            else:
+                new_quantities[item.inventory_item_id] = item.new_quantity
             
             # Create stock movement
-            movement = StockMovement(
+            movements.append(dict(
                 tenant_id=self.tenant_id,
                 store_id=self.store_id,
                 inventory_item_id=item.inventory_item_id,
@@ -312,14 +585,44 @@ class StockAdjustment(BaseModel, TenantMixin, StoreMixin):
                 notes=f"Stock adjustment: {self.reason}",
                 quantity_before=old_quantity,
                 quantity_after=item.new_quantity
-            )
-            movements.append(movement)
+            ))
         
         self.status = "applied"
         self.applied_by = user_id
         self.applied_at = func.now()
         
-        return movements
+        if session is None:
+            return [StockMovement(**movement) for movement in movements]
+        
+        if new_quantities:
+            self._set_inventory_quantities(session, new_quantities)
+        return StockMovement.insert_for_reference(session, movements)
+    
+    @staticmethod
+    def _set_inventory_quantities(session, new_quantities: dict):
+        """
+        Set on-hand quantities for many inventory items with one UPDATE.
+
+        Loaded items get the new values as their committed state, so the
+        unit of work does not issue a second UPDATE per item on flush.
+        """
+        new_quantity = case(new_quantities, value=InventoryItem.id)
+        session.execute(
+            update(InventoryItem)
+            .where(InventoryItem.id.in_(new_quantities))
+            .values(
+                quantity_on_hand=new_quantity,
+                quantity_available=new_quantity - InventoryItem.quantity_reserved
+            )
+            .execution_options(synchronize_session=False)
+        )
+        
+        for inventory_item_id, quantity in new_quantities.items():
+            inventory_item = session.get(InventoryItem, inventory_item_id)
+            set_committed_value(inventory_item, "quantity_on_hand", quantity)
+            set_committed_value(
+                inventory_item, "quantity_available", quantity - inventory_item.quantity_reserved
+            )
 
 
 class StockAdjustmentItem(BaseModel):
@@ -359,7 +662,7 @@ class StockAdjustmentItem(BaseModel):
         """Calculate value impact of the adjustment."""
         if self.unit_cost is None:
             return 0
-        return float(self.quantity_difference) * float(self.unit_cost)
+        return _extended_cost(self.quantity_difference, self.unit_cost)
     
     @property
     def is_increase(self):
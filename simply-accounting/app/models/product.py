@@ -3,8 +3,26 @@ Product models for catalog management.
 """
 
 from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, JSON
-from sqlalchemy.orm import relationship
-from app.models.base import BaseModel, TenantMixin
+from sqlalchemy import DDL, Index, event, exists, literal, select, update
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import object_session, relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import Grouping
+from app.models.base import BaseModel, TenantMixin, track_materialized_path
+
+
+def _sum_inventory(session, owner_column: str, owner_id: int, store_id: int = None):
+    """Sum quantity_on_hand over an owner's active inventory items in SQL."""
+    from app.models.inventory import InventoryItem
+    stmt = select(func.coalesce(func.sum(InventoryItem.quantity_on_hand), 0)).where(
+        getattr(InventoryItem, owner_column) == owner_id,
+        InventoryItem.is_active.is_(True),
+        InventoryItem.is_deleted.is_(False)
+    )
+    if store_id is not None:
+        stmt = stmt.where(InventoryItem.store_id == store_id)
+    return session.execute(stmt).scalar()
 
 
 class ProductCategory(BaseModel, TenantMixin):
@@ -16,6 +34,7 @@ class ProductCategory(BaseModel, TenantMixin):
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
     parent_id = Column(ForeignKey("product_categories.id"), nullable=True, index=True)
+    materialized_path = Column(String(500), nullable=True, index=True)  # "/<root id>/.../<own id>/"
     sort_order = Column(Integer, default=0, nullable=False)
     
     # SEO and Display
@@ -31,15 +50,44 @@ class ProductCategory(BaseModel, TenantMixin):
     def __repr__(self):
         return f"<ProductCategory(id={self.id}, name='{self.name}')>"
     
+    @property
+    def path_ids(self):
+        """Get the IDs from the root category down to this one."""
+        return [int(part) for part in self.materialized_path.strip("/").split("/")]
+    
     @property
     def full_path(self):
         """Get full category path."""
+        session = object_session(self)
+        if session is not None and self.materialized_path:
+            ids = self.path_ids
+            names = dict(session.execute(
+                select(ProductCategory.id, ProductCategory.name).where(ProductCategory.id.in_(ids))
+            ).all())
+            names[self.id] = self.name
+            return " > ".join(names[category_id] for category_id in ids)
+        
         if self.parent:
             return f"{self.parent.full_path} > {self.name}"
         return self.name
     
     def get_all_children(self):
         """Get all descendant categories."""
+        session = object_session(self)
+        if session is not None:
+            # One recursive CTE instead of a lazy load per node
+            descendants = (
+                select(ProductCategory.id)
+                .where(ProductCategory.parent_id == self.id)
+                .cte(name="descendants", recursive=True)
+            )
+            descendants = descendants.union_all(
+                select(ProductCategory.id).where(ProductCategory.parent_id == descendants.c.id)
+            )
+            return session.execute(
+                select(ProductCategory).where(ProductCategory.id.in_(select(descendants.c.id)))
+            ).scalars().all()
+        
         children = []
         for child in self.children:
             children.append(child)
@@ -47,11 +95,22 @@ class ProductCategory(BaseModel, TenantMixin):
         return children
 
 
+track_materialized_path(ProductCategory, "parent_id")
+
+
 class Product(BaseModel, TenantMixin):
     """
     Product model for catalog management.
     """
     __tablename__ = "products"
+    __table_args__ = (
+        # MySQL's stand-in for a trigram index: the ngram parser indexes
+        # every 2-character token, so substring searches go through search()
+        Index(
+            "ix_products_name_sku_fulltext", "name", "sku",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+        ),
+    )
     
     # Basic Information
     name = Column(String(255), nullable=False, index=True)
@@ -70,6 +129,7 @@ class Product(BaseModel, TenantMixin):
     # Inventory Management
     track_inventory = Column(Boolean, default=True, nullable=False)
     allow_backorder = Column(Boolean, default=False, nullable=False)
+    total_stock = Column(Numeric(12, 3), default=0, nullable=False, index=True)  # Maintained by inventory_items triggers
     
     # Physical Properties
     weight = Column(Numeric(8, 3), nullable=True)  # in kg
@@ -100,7 +160,10 @@ class Product(BaseModel, TenantMixin):
     # Relationships
     tenant = relationship("Tenant", back_populates="products")
     category = relationship("ProductCategory", back_populates="products")
+    # Left lazy so has_variants() runs as an EXISTS; use load_with_variants()
+    # where the variants themselves are shown
     variants = relationship("ProductVariant", back_populates="product", cascade="all, delete-orphan")
+    # Unbounded history; stock totals are summed in SQL instead of loading these
     inventory_items = relationship("InventoryItem", back_populates="product")
     sale_items = relationship("SaleItem", back_populates="product")
     
@@ -128,18 +191,107 @@ class Product(BaseModel, TenantMixin):
     
     def has_variants(self):
         """Check if product has variants."""
+        session = object_session(self)
+        if session is not None and "variants" not in self.__dict__:
+            return session.scalar(
+                select(exists().where(ProductVariant.product_id == self.id))
+            )
         return len(self.variants) > 0
     
     def get_total_inventory(self):
         """Get total inventory across all stores."""
+        session = object_session(self)
+        if session is not None and "inventory_items" not in self.__dict__:
+            # SessionLocal does not autoflush; write pending inventory changes
+            # so the SQL below sees them
+            session.flush()
+            if session.get_bind().dialect.name != "mysql":
+                # The total_stock triggers only exist on MySQL
+                return _sum_inventory(session, "product_id", self.id)
+            
+            # Kept current by the inventory_items triggers; re-read it so
+            # inventory writes earlier in this session show up
+            total_stock = session.scalar(select(Product.total_stock).where(Product.id == self.id))
+            set_committed_value(self, "total_stock", total_stock)
+            return total_stock
+        
         total = 0
         for item in self.inventory_items:
             if item.is_active and not item.is_deleted:
                 total += item.quantity_on_hand or 0
         return total
     
+    @classmethod
+    def backfill_total_stock(cls, session, product_ids=None):
+        """
+        Recompute total_stock from inventory_items with one UPDATE.
+
+        A one-off for rows that predate the inventory_items triggers, or to
+        repair drift; pass product_ids to limit it to some products.
+        """
+        from app.models.inventory import InventoryItem
+        stmt = update(cls).values(
+            total_stock=func.coalesce(
+                select(func.sum(InventoryItem.quantity_on_hand))
+                .where(
+                    InventoryItem.product_id == cls.id,
+                    InventoryItem.is_active.is_(True),
+                    InventoryItem.is_deleted.is_(False)
+                )
+                .correlate(cls)
+                .scalar_subquery(),
+                0
+            )
+        )
+        if product_ids is not None:
+            stmt = stmt.where(cls.id.in_(product_ids))
+        session.execute(stmt.execution_options(synchronize_session=False))
+    
+    @classmethod
+    def load_with_variants(cls, session, product_ids):
+        """
+        Load products with their variants, in one IN query for all variants.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id.in_(product_ids))
+            .options(selectinload(cls.variants))
+        ).scalars().all()
+    
+    @classmethod
+    def total_inventory_for(cls, session, product_ids, store_id: int = None):
+        """
+        Get total inventory for many products in one GROUP BY query.
+
+        Returns a dict of product id to quantity; products without active
+        inventory map to 0.
+        """
+        from app.models.inventory import InventoryItem
+        product_ids = list(product_ids)
+        totals = dict.fromkeys(product_ids, 0)
+        if not product_ids:
+            return totals
+        
+        stmt = (
+            select(InventoryItem.product_id, func.sum(InventoryItem.quantity_on_hand))
+            .where(
+                InventoryItem.product_id.in_(product_ids),
+                InventoryItem.is_active.is_(True),
+                InventoryItem.is_deleted.is_(False)
+            )
+            .group_by(InventoryItem.product_id)
+        )
+        if store_id is not None:
+            stmt = stmt.where(InventoryItem.store_id == store_id)
+        totals.update(session.execute(stmt).all())
+        return totals
+    
     def get_store_inventory(self, store_id: int):
         """Get inventory for a specific store."""
+        session = object_session(self)
+        if session is not None and "inventory_items" not in self.__dict__:
+            return _sum_inventory(session, "product_id", self.id, store_id)
+        
         for item in self.inventory_items:
             if item.store_id == store_id and item.is_active and not item.is_deleted:
                 return item.quantity_on_hand or 0
@@ -167,6 +319,26 @@ class Product(BaseModel, TenantMixin):
             self.attributes = {}
         self.attributes[key] = value
     
+    @classmethod
+    def search(cls, term: str):
+        """
+        Filter condition for products whose name or SKU contains term.
+
+        Uses ix_products_name_sku_fulltext instead of a LIKE '%term%' scan.
+        """
+        # A quoted phrase matches consecutive ngrams, i.e. the substring
+        phrase = term.replace('"', " ")
+        return match(cls.name, cls.sku, against=f'"{phrase}"').in_boolean_mode()
+    
+    @classmethod
+    def has_tag(cls, tag: str):
+        """
+        Filter condition for products carrying a tag.
+
+        Written as MEMBER OF so MySQL can answer it from ix_products_tags.
+        """
+        return literal(tag).op("MEMBER OF")(Grouping(cls.tags))
+    
     def add_tag(self, tag: str):
         """Add a tag to the product."""
         if not self.tags:
@@ -180,6 +352,18 @@ class Product(BaseModel, TenantMixin):
             self.tags.remove(tag)
 
 
+# Multi-valued index over the tag array (MySQL 8.0.17+), created with raw DDL
+# like ix_customers_tags
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_products_tags ON products "
+        "((CAST(tags AS CHAR(100) ARRAY)))"
+    ).execute_if(dialect="mysql")
+)
+
+
 class ProductVariant(BaseModel):
     """
     Product variant model for products with multiple options (size, color, etc.).
@@ -251,6 +435,10 @@ class ProductVariant(BaseModel):
     
     def get_total_inventory(self):
         """Get total inventory for this variant across all stores."""
+        session = object_session(self)
+        if session is not None and "inventory_items" not in self.__dict__:
+            return _sum_inventory(session, "variant_id", self.id)
+        
         total = 0
         for item in self.inventory_items:
             if item.is_active and not item.is_deleted:
@@ -259,6 +447,10 @@ class ProductVariant(BaseModel):
     
     def get_store_inventory(self, store_id: int):
         """Get inventory for this variant in a specific store."""
+        session = object_session(self)
+        if session is not None and "inventory_items" not in self.__dict__:
+            return _sum_inventory(session, "variant_id", self.id, store_id)
+        
         for item in self.inventory_items:
             if item.store_id == store_id and item.is_active and not item.is_deleted:
                 return item.quantity_on_hand or 0
@@ -3,10 +3,21 @@ Purchase order models for supplier management.
 """
 
 from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, DateTime, Enum, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Index, case, delete, exists, inspect, select, update
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import joinedload, object_session, relationship, selectinload
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 from enum import Enum as PyEnum
-from app.models.base import BaseModel, TenantMixin, StoreMixin
+from app.core.money import (
+    MONEY_PLACES,
+    QUANTITY_PLACES,
+    UNIT_COST_PLACES,
+    div_round_half_up,
+    from_minor_units,
+    to_minor_units
+)
+from app.models.base import BaseModel, TenantMixin, StoreMixin, get_item_index, track_item_index
 
 
 class PurchaseOrderStatus(PyEnum):
@@ -75,7 +86,7 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
     carrier = Column(String(100), nullable=True)
     
     # Additional Data
-    metadata = Column(JSON, nullable=True)
+    extra_data = Column("metadata", JSON, nullable=True)  # "metadata" is reserved on declarative models
     
     # Relationships
     tenant = relationship("Tenant")
@@ -83,48 +94,93 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
     supplier = relationship("Supplier", back_populates="purchase_orders")
     created_by = relationship("User", foreign_keys=[created_by_user_id])
     approved_by = relationship("User", foreign_keys=[approved_by_user_id])
+    # Left lazy so item totals and receipt checks run as aggregates; use
+    # load_with_items() where the lines themselves are rendered
     po_items = relationship("PurchaseOrderItem", back_populates="purchase_order", cascade="all, delete-orphan")
     receipts = relationship("GoodsReceipt", back_populates="purchase_order", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<PurchaseOrder(id={self.id}, number='{self.po_number}', total={self.total_amount}, status='{self.status}')>"
     
+    def get_item_totals(self):
+        """
+        Aggregate the order's items.
+
+        Returns (line_count, subtotal, quantity_ordered, quantity_received,
+        short_line_count). When po_items is not loaded the figures come from
+        one aggregate query instead of hydrating every item.
+        """
+        session = object_session(self)
+        if session is not None and "po_items" not in self.__dict__:
+            return tuple(session.execute(
+                select(
+                    func.count(PurchaseOrderItem.id),
+                    func.coalesce(func.sum(PurchaseOrderItem.line_total), 0),
+                    func.coalesce(func.sum(PurchaseOrderItem.quantity_ordered), 0),
+                    func.coalesce(func.sum(PurchaseOrderItem.quantity_received), 0),
+                    func.coalesce(func.sum(case(
+                        (PurchaseOrderItem.quantity_received < PurchaseOrderItem.quantity_ordered, 1),
+                        else_=0
+                    )), 0)
+                ).where(PurchaseOrderItem.purchase_order_id == self.id)
+            ).one())
+        
+        # One pass over the loaded items, each attribute read once
+        subtotal = ordered = received = 0
+        short_line_count = 0
+        for item in self.po_items:
+            quantity_ordered = item.quantity_ordered
+            # New items have no column defaults until they are flushed
+            quantity_received = item.quantity_received or 0
+            subtotal += item.line_total
+            ordered += quantity_ordered
+            received += quantity_received
+            if quantity_received < quantity_ordered:
+                short_line_count += 1
+        return len(self.po_items), subtotal, ordered, received, short_line_count
+    
+    def _has_item_where(self, *conditions):
+        """EXISTS check over the order's items, or None if they are loaded."""
+        session = object_session(self)
+        if session is None or "po_items" in self.__dict__:
+            return None
+        return session.scalar(
+            select(exists().where(PurchaseOrderItem.purchase_order_id == self.id, *conditions))
+        )
+    
     @property
     def is_fully_received(self):
         """Check if all items have been fully received."""
-        for item in self.po_items:
-            if item.quantity_received < item.quantity_ordered:
-                return False
-        return True
+        has_short_item = self._has_item_where(
+            PurchaseOrderItem.quantity_received < PurchaseOrderItem.quantity_ordered
+        )
+        if has_short_item is not None:
+            return not has_short_item
+        return all(item.quantity_received >= item.quantity_ordered for item in self.po_items)
     
     @property
     def is_partially_received(self):
         """Check if some items have been received."""
-        for item in self.po_items:
-            if item.quantity_received > 0:
-                return True
-        return False
+        has_received_item = self._has_item_where(PurchaseOrderItem.quantity_received > 0)
+        if has_received_item is not None:
+            return has_received_item
+        return any(item.quantity_received > 0 for item in self.po_items)
     
     @property
     def item_count(self):
         """Get total number of items ordered."""
-        return sum(item.quantity_ordered for item in self.po_items)
+        return self.get_item_totals()[2]
     
     @property
     def unique_item_count(self):
         """Get number of unique items in order."""
-        return len(self.po_items)
+        return self.get_item_totals()[0]
     
     @property
     def received_percentage(self):
         """Get percentage of items received."""
-        if not self.po_items:
-            return 0
-        
-        total_ordered = sum(item.quantity_ordered for item in self.po_items)
-        total_received = sum(item.quantity_received for item in self.po_items)
-        
-        if total_ordered == 0:
+        line_count, _, total_ordered, total_received, _ = self.get_item_totals()
+        if not line_count or total_ordered == 0:
             return 0
         
         return (total_received / total_ordered) * 100
@@ -145,7 +201,7 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
     def calculate_totals(self):
         """Calculate and update purchase order totals."""
         # Calculate subtotal from items
-        self.subtotal = sum(item.line_total for item in self.po_items)
+        self.subtotal = self.get_item_totals()[1]
         
         # Apply discount
         discounted_amount = self.subtotal - self.discount_amount
@@ -168,11 +224,7 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
                  unit_cost: float = None):
         """Add an item to the purchase order."""
         # Check if item already exists
-        existing_item = None
-        for item in self.po_items:
-            if item.product_id == product_id and item.variant_id == variant_id:
-                existing_item = item
-                break
+        existing_item = get_item_index(self, "po_items").get((product_id, variant_id))
         
         if existing_item:
             # Update existing item
@@ -185,6 +237,7 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
                 product_id=product_id,
                 variant_id=variant_id,
                 quantity_ordered=quantity,
+                quantity_received=0,
                 unit_cost=unit_cost
             )
             po_item.calculate_line_total()
@@ -194,7 +247,23 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
     
     def remove_item(self, po_item_id: int):
         """Remove an item from the purchase order."""
-        self.po_items = [item for item in self.po_items if item.id != po_item_id]
+        session = object_session(self)
+        if session is None or self.id is None or inspect(self).pending:
+            self.po_items = [item for item in self.po_items if item.id != po_item_id]
+            self.calculate_totals()
+            return
+        
+        # Write pending item edits first (the session does not autoflush),
+        # then delete just the one row and let calculate_totals() sum the
+        # rest in SQL
+        session.flush()
+        session.execute(
+            delete(PurchaseOrderItem).where(
+                PurchaseOrderItem.id == po_item_id,
+                PurchaseOrderItem.purchase_order_id == self.id
+            )
+        )
+        session.expire(self, ["po_items"])
         self.calculate_totals()
     
     def approve(self, user_id: int):
@@ -204,7 +273,27 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
         
         self.status = PurchaseOrderStatus.APPROVED
         self.approved_by_user_id = user_id
-        self.approved_at = func.now()
+        self.approved_at = datetime.now(timezone.utc)
+    
+    @classmethod
+    def approve_many(cls, session, purchase_order_ids, user_id: int):
+        """
+        Approve many draft purchase orders in one UPDATE.
+
+        Orders that are not drafts are left alone. Returns the number of
+        orders approved.
+        """
+        result = session.execute(
+            update(cls)
+            .where(cls.id.in_(purchase_order_ids), cls.status == PurchaseOrderStatus.DRAFT)
+            .values(
+                status=PurchaseOrderStatus.APPROVED,
+                approved_by_user_id=user_id,
+                approved_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
     
     def send_to_supplier(self):
         """Mark purchase order as sent to supplier."""
@@ -229,6 +318,31 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
         elif self.is_partially_received:
             self.status = PurchaseOrderStatus.PARTIALLY_RECEIVED
     
+    @classmethod
+    def load_with_items(cls, session, purchase_order_ids):
+        """
+        Load purchase orders with their items, in one IN query for all items.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id.in_(purchase_order_ids))
+            .options(selectinload(cls.po_items))
+        ).scalars().all()
+    
+    @classmethod
+    def load_for_complete(cls, session, purchase_order_ids):
+        """
+        Load purchase orders with their suppliers joined in.
+
+        complete() updates each supplier's purchase history; loading them in
+        the same query means completing a batch issues no supplier SELECTs.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id.in_(purchase_order_ids))
+            .options(joinedload(cls.supplier))
+        ).scalars().all()
+    
     def complete(self):
         """Mark purchase order as completed."""
         if not self.is_fully_received:
@@ -240,13 +354,24 @@ class PurchaseOrder(BaseModel, TenantMixin, StoreMixin):
         self.supplier.update_purchase_history(float(self.total_amount), self.order_date)
 
 
+track_item_index(PurchaseOrder, "po_items")
+
+
 class PurchaseOrderItem(BaseModel):
     """
     Individual items within a purchase order.
     """
     __tablename__ = "purchase_order_items"
-    
-    purchase_order_id = Column(ForeignKey("purchase_orders.id"), nullable=False, index=True)
+    __table_args__ = (
+        # Covers PurchaseOrder.get_item_totals(); MySQL has no INCLUDE, so
+        # the aggregated columns are trailing key columns
+        Index(
+            "ix_purchase_order_items_order_totals",
+            "purchase_order_id", "line_total", "quantity_ordered", "quantity_received"
+        ),
+    )
+    
+    purchase_order_id = Column(ForeignKey("purchase_orders.id"), nullable=False)
     product_id = Column(ForeignKey("products.id"), nullable=False, index=True)
     variant_id = Column(ForeignKey("product_variants.id"), nullable=True, index=True)
     
@@ -262,33 +387,55 @@ class PurchaseOrderItem(BaseModel):
     
     # Relationships
     purchase_order = relationship("PurchaseOrder", back_populates="po_items")
-    product = relationship("Product")
-    variant = relationship("ProductVariant")
+    product = relationship("Product", lazy="joined")
+    variant = relationship("ProductVariant", lazy="joined")
     receipt_items = relationship("GoodsReceiptItem", back_populates="po_item")
     
     def __repr__(self):
         return f"<PurchaseOrderItem(id={self.id}, product_id={self.product_id}, qty_ordered={self.quantity_ordered}, qty_received={self.quantity_received})>"
     
-    @property
+    @hybrid_property
     def quantity_outstanding(self):
         """Get quantity still to be received."""
         return self.quantity_ordered - self.quantity_received
     
-    @property
+    @hybrid_property
     def is_fully_received(self):
         """Check if item is fully received."""
         return self.quantity_received >= self.quantity_ordered
     
-    @property
+    @hybrid_property
     def received_percentage(self):
         """Get percentage received."""
         if self.quantity_ordered == 0:
             return 0
         return (self.quantity_received / self.quantity_ordered) * 100
     
+    @received_percentage.expression
+    def received_percentage(cls):
+        return case(
+            (cls.quantity_ordered == 0, 0),
+            else_=cls.quantity_received * 100 / cls.quantity_ordered
+        )
+    
     def calculate_line_total(self):
         """Calculate line total."""
-        self.line_total = float(self.quantity_ordered) * float(self.unit_cost)
+        # Work in thousandths of a unit and ten-thousandths of the unit cost
+        quantity = to_minor_units(self.quantity_ordered, QUANTITY_PLACES)
+        unit_cost = to_minor_units(self.unit_cost, UNIT_COST_PLACES)
+        self.line_total = from_minor_units(
+            div_round_half_up(quantity * unit_cost, 10 ** (QUANTITY_PLACES + UNIT_COST_PLACES - MONEY_PLACES))
+        )
+    
+    @classmethod
+    def recalc_all(cls, session, purchase_order_id: int):
+        """Recalculate line totals for all of an order's items in one UPDATE."""
+        session.execute(
+            update(cls)
+            .where(cls.purchase_order_id == purchase_order_id)
+            .values(line_total=func.round(cls.quantity_ordered * cls.unit_cost, MONEY_PLACES))
+            .execution_options(synchronize_session=False)
+        )
     
     def receive_quantity(self, quantity: float):
         """Record received quantity."""
@@ -340,66 +487,151 @@ class GoodsReceipt(BaseModel, TenantMixin, StoreMixin):
         """Get total quantity of items received."""
         return sum(item.quantity_received for item in self.receipt_items)
     
+    @classmethod
+    def load_for_complete(cls, session, receipt_id: int):
+        """
+        Load a receipt with its items and their purchase order items.
+
+        Uses two IN queries for the whole tree, so complete_receipt() runs
+        without any per-item lazy loads.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id == receipt_id)
+            .options(
+                selectinload(cls.receipt_items)
+                .selectinload(GoodsReceiptItem.po_item)
+            )
+        ).scalars().first()
+    
     def complete_receipt(self):
-        """Complete the goods receipt and update inventory."""
+        """
+        Complete the goods receipt and update inventory.
+
+        Returns the receipt's StockMovement objects. The touched inventory
+        items are written back with a single UPDATE and the movements with a
+        single multi-row INSERT.
+        """
+        from app.models.inventory import InventoryItem, MovementType, StockMovement
+        
         if self.status != "draft":
             raise ValueError("Only draft receipts can be completed")
         
-        stock_movements = []
+        session = object_session(self)
+        if not all("po_item" in item.__dict__ for item in self.receipt_items):
+            # Load every purchase order item in one query so item.po_item
+            # below is an identity map hit instead of a lazy load per line
+            po_item_ids = [item.po_item_id for item in self.receipt_items]
+            session.execute(
+                select(PurchaseOrderItem).where(PurchaseOrderItem.id.in_(po_item_ids))
+            ).scalars().all()
+        
+        inventory_items = self._get_or_create_inventory_items(
+            session, {(item.po_item.product_id, item.po_item.variant_id) for item in self.receipt_items}
+        )
+        notes = f"Goods receipt from PO {self.purchase_order.po_number}"
         
+        movements = []
         for item in self.receipt_items:
             # Update purchase order item
-            item.po_item.receive_quantity(item.quantity_received)
-            
-            # Update inventory
-            inventory_item = self.get_or_create_inventory_item(
-                item.po_item.product_id, 
-                item.po_item.variant_id
-            )
+            po_item = item.po_item
+            po_item.receive_quantity(item.quantity_received)
             
             # Update inventory quantities
+            inventory_item = inventory_items[(po_item.product_id, po_item.variant_id)]
             old_quantity = inventory_item.quantity_on_hand
-            inventory_item.quantity_on_hand += item.quantity_received
-            inventory_item.update_available_quantity()
             
-            # Update cost using weighted average
-            inventory_item.update_cost(float(item.unit_cost), float(item.quantity_received))
+            # Update cost using weighted average, before the quantity grows
+            inventory_item.update_cost(item.unit_cost, item.quantity_received)
+            inventory_item.quantity_on_hand = old_quantity + item.quantity_received
+            inventory_item.update_available_quantity()
             
             # Create stock movement
-            from app.models.inventory import StockMovement, MovementType
-            movement = StockMovement(
+            movements.append(dict(
                 tenant_id=self.tenant_id,
                 store_id=self.store_id,
                 inventory_item_id=inventory_item.id,
-                product_id=item.po_item.product_id,
-                variant_id=item.po_item.variant_id,
+                product_id=po_item.product_id,
+                variant_id=po_item.variant_id,
                 movement_type=MovementType.PURCHASE,
                 quantity=item.quantity_received,
                 unit_cost=item.unit_cost,
                 reference_type="goods_receipt",
                 reference_id=self.id,
                 reference_number=self.receipt_number,
-                notes=f"Goods receipt from PO {self.purchase_order.po_number}",
+                notes=notes,
                 quantity_before=old_quantity,
                 quantity_after=inventory_item.quantity_on_hand
-            )
-            stock_movements.append(movement)
+            ))
         
         self.status = "completed"
         
         # Update purchase order status
         self.purchase_order.update_status_based_on_receipts()
         
-        return stock_movements
+        if inventory_items:
+            InventoryItem.write_stock_levels(session, inventory_items.values())
+        return StockMovement.insert_for_reference(session, movements)
     
-    def get_or_create_inventory_item(self, product_id: int, variant_id: int = None):
-        """Get or create inventory item for the product/variant in this store."""
+    def _get_or_create_inventory_items(self, session, keys):
+        """
+        Map (product_id, variant_id) keys to this store's inventory items.
+
+        Existing items are loaded with one query, scoped to the tenant and to
+        stock without a lot number; missing ones are created with zero stock
+        and flushed together so they have IDs. A soft-deleted or inactive
+        item holds the same unique stock key, so it is restored with zero
+        stock instead of being used as it was.
+        """
         from app.models.inventory import InventoryItem
-        from sqlalchemy.orm import Session
         
-        # This would need to be implemented with proper session handling
-        # For now, it's a placeholder
-        pass
+        if not keys:
+            return {}
+        
+        inventory_items = {}
+        for inventory_item in session.execute(
+            select(InventoryItem).where(
+                InventoryItem.tenant_id == self.tenant_id,
+                InventoryItem.store_id == self.store_id,
+                InventoryItem.product_id.in_({product_id for product_id, _ in keys}),
+                InventoryItem.lot_number.is_(None)
+            )
+        ).scalars():
+            key = (inventory_item.product_id, inventory_item.variant_id)
+            if key not in keys:
+                continue
+            if inventory_item.is_deleted or not inventory_item.is_active:
+                inventory_item.restore()
+                inventory_item.quantity_on_hand = 0
+                inventory_item.quantity_reserved = 0
+                inventory_item.quantity_available = 0
+            inventory_items[key] = inventory_item
+        
+        missing = [
+            InventoryItem(
+                tenant_id=self.tenant_id,
+                store_id=self.store_id,
+                product_id=product_id,
+                variant_id=variant_id,
+                quantity_on_hand=0,
+                quantity_reserved=0,
+                quantity_available=0
+            )
+            for product_id, variant_id in keys - inventory_items.keys()
+        ]
+        if missing:
+            session.add_all(missing)
+            session.flush()
+            for inventory_item in missing:
+                inventory_items[(inventory_item.product_id, inventory_item.variant_id)] = inventory_item
+        
+        return {key: inventory_items[key] for key in keys}
+    
+    def get_or_create_inventory_item(self, product_id: int, variant_id: int = None):
+        """Get or create inventory item for the product/variant in this store."""
+        return self._get_or_create_inventory_items(
+            object_session(self), {(product_id, variant_id)}
+        )[(product_id, variant_id)]
 
 
 class GoodsReceiptItem(BaseModel):
@@ -433,10 +665,17 @@ class GoodsReceiptItem(BaseModel):
     def __repr__(self):
         return f"<GoodsReceiptItem(id={self.id}, po_item_id={self.po_item_id}, qty={self.quantity_received})>"
     
-    @property
+    @hybrid_property
     def line_total(self):
         """Calculate line total value."""
-        return float(self.quantity_received) * float(self.unit_cost)
+        return from_minor_units(
+            to_minor_units(self.quantity_received, QUANTITY_PLACES) * to_minor_units(self.unit_cost, UNIT_COST_PLACES),
+            QUANTITY_PLACES + UNIT_COST_PLACES
+        )
+    
+    @line_total.expression
+    def line_total(cls):
+        return cls.quantity_received * cls.unit_cost
     
     @property
     def is_damaged(self):
@@ -2,11 +2,43 @@
 Sales transaction models for POS system.
 """
 
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, DateTime, Enum, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Boolean, ForeignKey, Numeric, Integer, DateTime, Date, Enum, JSON
+from sqlalchemy import Index, and_, case, delete, event, insert, select, update
+from sqlalchemy.orm import joinedload, object_session, raiseload, relationship, selectinload
 from sqlalchemy.sql import func
+from datetime import date, datetime, time, timezone
 from enum import Enum as PyEnum
-from app.models.base import BaseModel, TenantMixin, StoreMixin
+from app.core.money import (
+    MONEY_PLACES,
+    QUANTITY_PLACES,
+    RATE_PLACES,
+    UNIT_COST_PLACES,
+    div_round_half_up,
+    from_minor_units,
+    to_minor_units
+)
+from app.core.database import Base
+from app.models.base import BaseModel, TenantMixin, StoreMixin, get_item_index, track_item_index
+
+
+def _add_money(amount, delta, places: int = 2):
+    """Exact amount + delta, computed in integer minor units."""
+    return from_minor_units(to_minor_units(amount, places) + to_minor_units(delta, places), places)
+
+
+def _line_amounts(quantity, unit_price, discount_amount, tax_rate):
+    """Tax and line total in cents for one sale line."""
+    base_amount = div_round_half_up(
+        to_minor_units(quantity, QUANTITY_PLACES) * to_minor_units(unit_price), 10 ** QUANTITY_PLACES
+    )
+    discounted_amount = base_amount - to_minor_units(discount_amount)
+    if tax_rate:
+        tax_amount = div_round_half_up(
+            discounted_amount * to_minor_units(tax_rate, RATE_PLACES), 10 ** RATE_PLACES
+        )
+    else:
+        tax_amount = 0
+    return tax_amount, discounted_amount + tax_amount
 
 
 class SaleStatus(PyEnum):
@@ -31,11 +63,28 @@ class PaymentMethod(PyEnum):
     LOYALTY_POINTS = "loyalty_points"
 
 
+_PAYMENT_METHOD_NAMES = {
+    PaymentMethod.CASH: "Cash",
+    PaymentMethod.CREDIT_CARD: "Credit Card",
+    PaymentMethod.DEBIT_CARD: "Debit Card",
+    PaymentMethod.CHECK: "Check",
+    PaymentMethod.BANK_TRANSFER: "Bank Transfer",
+    PaymentMethod.DIGITAL_WALLET: "Digital Wallet",
+    PaymentMethod.STORE_CREDIT: "Store Credit",
+    PaymentMethod.LOYALTY_POINTS: "Loyalty Points"
+}
+
+
 class Sale(BaseModel, TenantMixin, StoreMixin):
     """
     Sale model for POS transactions.
     """
     __tablename__ = "sales"
+    __table_args__ = (
+        # Revenue and dashboard queries filter on status within a date range;
+        # the MySQL ENUM status key is a single byte
+        Index("ix_sales_tenant_store_status_date", "tenant_id", "store_id", "status", "sale_date"),
+    )
     
     # Sale Information
     sale_number = Column(String(50), unique=True, nullable=False, index=True)
@@ -45,7 +94,7 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
     customer_id = Column(ForeignKey("customers.id"), nullable=True, index=True)
     
     # Sale Details
-    status = Column(Enum(SaleStatus), default=SaleStatus.DRAFT, nullable=False, index=True)
+    status = Column(Enum(SaleStatus), default=SaleStatus.DRAFT, nullable=False)
     sale_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     
     # Amounts
@@ -54,6 +103,10 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
     discount_amount = Column(Numeric(10, 2), default=0, nullable=False)
     total_amount = Column(Numeric(10, 2), default=0, nullable=False)
     
+    # Item Totals, kept current by add_item/remove_item (see audit_totals)
+    item_count = Column(Numeric(12, 3), default=0, nullable=False)  # Total quantity
+    line_count = Column(Integer, default=0, nullable=False)  # Number of sale items
+    
     # Payment Information
     amount_paid = Column(Numeric(10, 2), default=0, nullable=False)
     amount_due = Column(Numeric(10, 2), default=0, nullable=False)
@@ -85,15 +138,15 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
     refund_reason = Column(Text, nullable=True)
     
     # Additional Data
-    metadata = Column(JSON, nullable=True)  # Additional sale data
+    extra_data = Column("metadata", JSON, nullable=True)  # Additional sale data; "metadata" is reserved on declarative models
     
     # Relationships
     tenant = relationship("Tenant")
     store = relationship("Store", back_populates="sales")
     customer = relationship("Customer", back_populates="sales")
     cashier = relationship("User", foreign_keys=[cashier_id], back_populates="created_sales")
-    sale_items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan")
-    payments = relationship("SalePayment", back_populates="sale", cascade="all, delete-orphan")
+    sale_items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan", lazy="selectin")
+    payments = relationship("SalePayment", back_populates="sale", cascade="all, delete-orphan", lazy="selectin")
     
     def __repr__(self):
         return f"<Sale(id={self.id}, number='{self.sale_number}', total={self.total_amount}, status='{self.status}')>"
@@ -108,71 +161,159 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
         """Check if sale is overpaid."""
         return self.amount_paid > self.total_amount
     
-    @property
-    def item_count(self):
-        """Get total number of items in sale."""
-        return sum(item.quantity for item in self.sale_items)
-    
     @property
     def unique_item_count(self):
         """Get number of unique items in sale."""
-        return len(self.sale_items)
+        return self.line_count
+    
+    def _add_to_item_totals(self, quantity, line_total, lines: int = 0, old_line_total=0):
+        """Apply one item change to the denormalized item totals."""
+        self.item_count = _add_money(self.item_count, quantity, QUANTITY_PLACES)
+        self.subtotal = from_minor_units(
+            to_minor_units(self.subtotal) + to_minor_units(line_total) - to_minor_units(old_line_total)
+        )
+        self.line_count = (self.line_count or 0) + lines
+    
+    def audit_totals(self):
+        """
+        Recompute the denormalized totals from the sale's items and payments.
+
+        Corrects drift from item or payment rows written outside add_item,
+        remove_item and add_payment. Returns True if anything was off.
+        """
+        item_count = subtotal = amount_paid = 0
+        for item in self.sale_items:
+            item_count = _add_money(item_count, item.quantity, QUANTITY_PLACES)
+            subtotal = _add_money(subtotal, item.line_total)
+        for payment in self.payments:
+            amount_paid = _add_money(amount_paid, payment.amount)
+        
+        drifted = (
+            to_minor_units(self.item_count, QUANTITY_PLACES) != to_minor_units(item_count, QUANTITY_PLACES)
+            or to_minor_units(self.subtotal) != to_minor_units(subtotal)
+            or to_minor_units(self.amount_paid) != to_minor_units(amount_paid)
+            or (self.line_count or 0) != len(self.sale_items)
+        )
+        if drifted:
+            self.item_count = item_count
+            self.subtotal = subtotal
+            self.amount_paid = amount_paid
+            self.line_count = len(self.sale_items)
+            self.calculate_totals()
+        return drifted
     
     def calculate_totals(self):
-        """Calculate and update sale totals."""
-        # Calculate subtotal from items
-        self.subtotal = sum(item.line_total for item in self.sale_items)
+        """Calculate and update sale totals from the running subtotal."""
+        # Work in cents and ten-thousandths of a rate, like the subtotal
+        subtotal = to_minor_units(self.subtotal)
         
         # Apply discount
         if self.discount_type == "percentage" and self.discount_value:
-            self.discount_amount = self.subtotal * (self.discount_value / 100)
+            discount = div_round_half_up(
+                subtotal * to_minor_units(self.discount_value, RATE_PLACES), 100 * 10 ** RATE_PLACES
+            )
         elif self.discount_type == "fixed_amount" and self.discount_value:
-            self.discount_amount = min(self.discount_value, self.subtotal)
+            discount = min(to_minor_units(self.discount_value), subtotal)
         else:
-            self.discount_amount = 0
+            discount = 0
         
         # Calculate tax
-        taxable_amount = self.subtotal - self.discount_amount
+        taxable_amount = subtotal - discount
         if self.tax_rate:
+            tax_rate = to_minor_units(self.tax_rate, RATE_PLACES)
             if self.tax_inclusive:
                 # Tax is included in the price
-                self.tax_amount = taxable_amount * (self.tax_rate / (1 + self.tax_rate))
-                self.total_amount = taxable_amount
+                tax = div_round_half_up(taxable_amount * tax_rate, 10 ** RATE_PLACES + tax_rate)
+                total = taxable_amount
             else:
                 # Tax is added to the price
-                self.tax_amount = taxable_amount * self.tax_rate
-                self.total_amount = taxable_amount + self.tax_amount
+                tax = div_round_half_up(taxable_amount * tax_rate, 10 ** RATE_PLACES)
+                total = taxable_amount + tax
         else:
-            self.tax_amount = 0
-            self.total_amount = taxable_amount
+            tax = 0
+            total = taxable_amount
+        
+        paid = to_minor_units(self.amount_paid)
+        self.discount_amount = from_minor_units(discount)
+        self.tax_amount = from_minor_units(tax)
+        self.total_amount = from_minor_units(total)
         
         # Calculate amount due
-        self.amount_due = self.total_amount - self.amount_paid
+        self.amount_due = from_minor_units(total - paid)
         
         # Calculate change
-        if self.amount_paid > self.total_amount:
-            self.change_amount = self.amount_paid - self.total_amount
-        else:
-            self.change_amount = 0
+        self.change_amount = from_minor_units(max(paid - total, 0))
+    
+    @classmethod
+    def recalculate_sql(cls, session, sale_ids):
+        """
+        Recalculate sale totals from their items entirely in the database.
+
+        One UPDATE sums the items and derives discount, tax, total, amount
+        due and change with the same rounding as calculate_totals(). MySQL
+        applies single-table SET clauses in order, so each expression sees
+        the values assigned before it.
+        """
+        def item_aggregate(expression):
+            return (
+                select(expression)
+                .where(SaleItem.sale_id == cls.id)
+                .correlate_except(SaleItem)
+                .scalar_subquery()
+            )
+        
+        taxable_amount = cls.subtotal - cls.discount_amount
+        has_tax = and_(cls.tax_rate.isnot(None), cls.tax_rate != 0)
+        session.execute(
+            update(cls)
+            .where(cls.id.in_(sale_ids))
+            .ordered_values(
+                (cls.subtotal, item_aggregate(func.coalesce(func.sum(SaleItem.line_total), 0))),
+                (cls.item_count, item_aggregate(func.coalesce(func.sum(SaleItem.quantity), 0))),
+                (cls.line_count, item_aggregate(func.count(SaleItem.id))),
+                (cls.discount_amount, case(
+                    (and_(cls.discount_type == "percentage", cls.discount_value != 0),
+                     func.round(cls.subtotal * cls.discount_value / 100, 2)),
+                    (and_(cls.discount_type == "fixed_amount", cls.discount_value != 0),
+                     func.least(cls.discount_value, cls.subtotal)),
+                    else_=0
+                )),
+                (cls.tax_amount, case(
+                    (and_(has_tax, cls.tax_inclusive),
+                     func.round(taxable_amount * cls.tax_rate / (1 + cls.tax_rate), 2)),
+                    (has_tax, func.round(taxable_amount * cls.tax_rate, 2)),
+                    else_=0
+                )),
+                (cls.total_amount, case(
+                    (cls.tax_inclusive, taxable_amount),
+                    else_=taxable_amount + cls.tax_amount
+                )),
+                (cls.amount_due, cls.total_amount - cls.amount_paid),
+                (cls.change_amount, func.greatest(cls.amount_paid - cls.total_amount, 0))
+            )
+            .execution_options(synchronize_session=False)
+        )
     
     def add_item(self, product_id: int, variant_id: int = None, quantity: float = 1, 
                  unit_price: float = None, discount_amount: float = 0):
         """Add an item to the sale."""
         # Check if item already exists
-        existing_item = None
-        for item in self.sale_items:
-            if item.product_id == product_id and item.variant_id == variant_id:
-                existing_item = item
-                break
+        existing_item = get_item_index(self, "sale_items").get((product_id, variant_id))
         
         if existing_item:
             # Update existing item
+            old_line_total = existing_item.line_total
             existing_item.quantity += quantity
             existing_item.calculate_line_total()
+            self._add_to_item_totals(
+                quantity, existing_item.line_total, old_line_total=old_line_total
+            )
         else:
             # Create new item
             sale_item = SaleItem(
                 sale_id=self.id,
+                tenant_id=self.tenant_id,
+                store_id=self.store_id,
                 product_id=product_id,
                 variant_id=variant_id,
                 quantity=quantity,
@@ -181,12 +322,83 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
             )
             sale_item.calculate_line_total()
             self.sale_items.append(sale_item)
+            self._add_to_item_totals(quantity, sale_item.line_total, lines=1)
         
         self.calculate_totals()
     
+    def add_items_bulk(self, items):
+        """
+        Add many lines to the sale with one multi-row INSERT.
+
+        Each item is a dict with product_id and unit_price, and optionally
+        quantity (default 1), variant_id, discount_amount, tax_rate,
+        unit_cost and notes. Line totals are computed in one pass and the
+        sale totals once at the end. Unlike add_item(), lines are not merged
+        with existing lines for the same product. Meant for imports and
+        seeding.
+        """
+        items = list(items)
+        for item in items:
+            if item.get("product_id") is None or item.get("unit_price") is None:
+                raise ValueError("Each item needs a product_id and a unit_price")
+        
+        session = object_session(self)
+        if session is None:
+            for item in items:
+                self.add_item(
+                    item["product_id"], item.get("variant_id"), item.get("quantity", 1),
+                    item["unit_price"], item.get("discount_amount", 0)
+                )
+            return
+        
+        if self.id is None:
+            session.flush()
+        
+        sale_date = self.sale_date if self.status == SaleStatus.COMPLETED else None
+        rows = []
+        quantity_total = 0
+        line_total_sum = 0
+        for item in items:
+            quantity = item.get("quantity", 1)
+            discount_amount = item.get("discount_amount", 0)
+            tax_rate = item.get("tax_rate")
+            tax_amount, line_total = _line_amounts(quantity, item["unit_price"], discount_amount, tax_rate)
+            rows.append({
+                "sale_id": self.id,
+                "tenant_id": self.tenant_id,
+                "store_id": self.store_id,
+                "sale_date": sale_date,
+                "product_id": item["product_id"],
+                "variant_id": item.get("variant_id"),
+                "quantity": quantity,
+                "unit_price": item["unit_price"],
+                "discount_amount": discount_amount,
+                "tax_rate": tax_rate,
+                "tax_amount": from_minor_units(tax_amount),
+                "line_total": from_minor_units(line_total),
+                "unit_cost": item.get("unit_cost"),
+                "notes": item.get("notes")
+            })
+            quantity_total = _add_money(quantity_total, quantity, QUANTITY_PLACES)
+            line_total_sum += line_total
+        
+        if not rows:
+            return
+        
+        session.execute(insert(SaleItem), rows)
+        session.expire(self, ["sale_items"])
+        self._add_to_item_totals(quantity_total, from_minor_units(line_total_sum), lines=len(rows))
+        self.calculate_totals()
+    
     def remove_item(self, sale_item_id: int):
         """Remove an item from the sale."""
-        self.sale_items = [item for item in self.sale_items if item.id != sale_item_id]
+        kept_items = []
+        for item in self.sale_items:
+            if item.id == sale_item_id:
+                self._add_to_item_totals(-item.quantity, 0, lines=-1, old_line_total=item.line_total)
+            else:
+                kept_items.append(item)
+        self.sale_items = kept_items
         self.calculate_totals()
     
     def apply_discount(self, discount_type: str, discount_value: float, reason: str = None):
@@ -209,28 +421,80 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
         self.payments.append(payment)
         
         # Update amount paid
-        self.amount_paid = sum(p.amount for p in self.payments)
+        self.amount_paid = _add_money(self.amount_paid, amount)
         self.calculate_totals()
         
         return payment
     
-    def complete_sale(self):
-        """Complete the sale."""
+    @classmethod
+    def load_for_list(cls, session, sale_ids):
+        """
+        Load sales for list views without their items or payments.
+
+        Counts, totals and amounts paid are kept as columns on the sale, so
+        list rendering needs no child rows at all. Touching sale_items or
+        payments on the returned sales raises instead of loading, so they
+        must not be passed to add_item(), remove_item() or audit_totals().
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id.in_(sale_ids))
+            .options(raiseload(cls.sale_items), raiseload(cls.payments))
+        ).scalars().all()
+    
+    @classmethod
+    def load_for_receipt(cls, session, sale_id: int):
+        """
+        Load a sale with everything a receipt shows.
+
+        Items come with their products and variants joined in and payments
+        in one IN query, so rendering issues no per-line lazy loads.
+        """
+        return session.execute(
+            select(cls)
+            .where(cls.id == sale_id)
+            .options(
+                selectinload(cls.sale_items).options(
+                    joinedload(SaleItem.product), joinedload(SaleItem.variant)
+                ),
+                selectinload(cls.payments)
+            )
+        ).scalars().first()
+    
+    def complete_sale(self, apply_loyalty: bool = True):
+        """
+        Complete the sale.
+
+        Pass apply_loyalty=False when loyalty points are credited later in
+        bulk with Customer.batch_apply_loyalty.
+        """
         if self.status != SaleStatus.DRAFT:
             raise ValueError("Only draft sales can be completed")
         
+        session = object_session(self)
+        if session is not None and self.id is not None:
+            # Settle the totals against the stored items before checking payment
+            session.flush()
+            Sale.recalculate_sql(session, [self.id])
+            session.expire(self, [
+                "subtotal", "item_count", "line_count", "discount_amount",
+                "tax_amount", "total_amount", "amount_due", "change_amount"
+            ])
+        
         if not self.is_paid:
             raise ValueError("Sale must be fully paid to complete")
         
         self.status = SaleStatus.COMPLETED
-        self.sale_date = func.now()
+        self.sale_date = datetime.now(timezone.utc)
+        for item in self.sale_items:
+            item.sale_date = self.sale_date
         
         # Update customer purchase history
         if self.customer:
             self.customer.update_purchase_history(float(self.total_amount), self.sale_date)
             
             # Add loyalty points
-            if self.loyalty_points_earned > 0:
+            if apply_loyalty and self.loyalty_points_earned > 0:
                 self.customer.add_loyalty_points(self.loyalty_points_earned)
     
     def cancel_sale(self, reason: str = None):
@@ -261,13 +525,23 @@ class Sale(BaseModel, TenantMixin, StoreMixin):
             self.refund_reason = reason
 
 
-class SaleItem(BaseModel):
+track_item_index(Sale, "sale_items")
+
+
+class SaleItem(BaseModel, TenantMixin, StoreMixin):
     """
     Individual items within a sale.
+
+    tenant_id, store_id and sale_date are copied from the sale so line-level
+    reports can filter without joining sales.
     """
     __tablename__ = "sale_items"
+    __table_args__ = (
+        Index("ix_sale_items_tenant_store_date_product", "tenant_id", "store_id", "sale_date", "product_id"),
+    )
     
     sale_id = Column(ForeignKey("sales.id"), nullable=False, index=True)
+    sale_date = Column(DateTime(timezone=True), nullable=True)  # Copied from the sale
     product_id = Column(ForeignKey("products.id"), nullable=False, index=True)
     variant_id = Column(ForeignKey("product_variants.id"), nullable=True, index=True)
     
@@ -298,53 +572,106 @@ class SaleItem(BaseModel):
     def __repr__(self):
         return f"<SaleItem(id={self.id}, product_id={self.product_id}, qty={self.quantity}, total={self.line_total})>"
     
+    def _base_amount(self):
+        """Quantity times unit price, in cents."""
+        return div_round_half_up(
+            to_minor_units(self.quantity, QUANTITY_PLACES) * to_minor_units(self.unit_price),
+            10 ** QUANTITY_PLACES
+        )
+    
+    def _profit_units(self):
+        """Line total less quantity times unit cost, in cents."""
+        cost_total = div_round_half_up(
+            to_minor_units(self.quantity, QUANTITY_PLACES) * to_minor_units(self.unit_cost, UNIT_COST_PLACES),
+            10 ** (QUANTITY_PLACES + UNIT_COST_PLACES - MONEY_PLACES)
+        )
+        return to_minor_units(self.line_total) - cost_total
+    
     @property
     def profit_amount(self):
         """Calculate profit for this line item."""
         if not self.unit_cost:
             return 0
         
-        cost_total = float(self.quantity) * float(self.unit_cost)
-        return float(self.line_total) - cost_total
+        return from_minor_units(self._profit_units())
     
     @property
     def profit_margin(self):
         """Calculate profit margin percentage."""
-        if not self.unit_cost or self.line_total == 0:
+        line_total = to_minor_units(self.line_total)
+        if not self.unit_cost or line_total == 0:
             return 0
         
-        return (self.profit_amount / float(self.line_total)) * 100
+        # Hundredths of a percent
+        return from_minor_units(div_round_half_up(self._profit_units() * 100 * 100, line_total))
     
     def calculate_line_total(self):
         """Calculate line total including discounts and taxes."""
-        # Base amount
-        base_amount = float(self.quantity) * float(self.unit_price)
-        
-        # Apply discount
-        discounted_amount = base_amount - float(self.discount_amount)
+        tax_amount, line_total = _line_amounts(
+            self.quantity, self.unit_price, self.discount_amount, self.tax_rate
+        )
+        self.tax_amount = from_minor_units(tax_amount)
+        self.line_total = from_minor_units(line_total)
+    
+    @classmethod
+    def recalc_line_totals(cls, session, tenant_id: int, since=None, until=None):
+        """
+        Recalculate tax and line totals for a tenant's items in one UPDATE.
+
+        Used by batch audits after price or tax corrections; filters on the
+        denormalized sale_date so no join to sales is needed. Returns the
+        number of rows matched.
+        """
+        conditions = [cls.tenant_id == tenant_id]
+        if since is not None:
+            conditions.append(cls.sale_date >= since)
+        if until is not None:
+            conditions.append(cls.sale_date < until)
         
-        # Apply tax if specified
-        if self.tax_rate:
-            self.tax_amount = discounted_amount * float(self.tax_rate)
-            self.line_total = discounted_amount + float(self.tax_amount)
-        else:
-            self.tax_amount = 0
-            self.line_total = discounted_amount
+        discounted_amount = func.round(cls.quantity * cls.unit_price, MONEY_PLACES) - cls.discount_amount
+        result = session.execute(
+            update(cls)
+            .where(*conditions)
+            .ordered_values(
+                (cls.tax_amount, func.round(discounted_amount * func.coalesce(cls.tax_rate, 0), MONEY_PLACES)),
+                (cls.line_total, discounted_amount + cls.tax_amount)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
     
     def apply_discount(self, discount_amount: float = None, discount_percentage: float = None):
         """Apply discount to the item."""
         if discount_percentage:
-            base_amount = float(self.quantity) * float(self.unit_price)
-            self.discount_amount = base_amount * (discount_percentage / 100)
+            base_amount = self._base_amount()
+            self.discount_amount = from_minor_units(div_round_half_up(
+                base_amount * to_minor_units(discount_percentage), 100 * 100
+            ))
             self.discount_percentage = discount_percentage
         elif discount_amount:
             self.discount_amount = discount_amount
-            base_amount = float(self.quantity) * float(self.unit_price)
-            self.discount_percentage = (discount_amount / base_amount) * 100 if base_amount > 0 else 0
+            base_amount = self._base_amount()
+            self.discount_percentage = from_minor_units(div_round_half_up(
+                to_minor_units(discount_amount) * 100 * 100, base_amount
+            )) if base_amount > 0 else 0
         
         self.calculate_line_total()
 
 
+@event.listens_for(SaleItem, "before_insert")
+def _copy_sale_columns(mapper, connection, target):
+    """Fill the denormalized sale columns on items added outside add_item()."""
+    sale = target.sale
+    if sale is None:
+        return
+    if target.tenant_id is None:
+        target.tenant_id = sale.tenant_id
+    if target.store_id is None:
+        target.store_id = sale.store_id
+    if target.sale_date is None and sale.status == SaleStatus.COMPLETED:
+        target.sale_date = sale.sale_date
+
+
 class SalePayment(BaseModel):
     """
     Payment records for sales.
@@ -375,14 +702,70 @@ class SalePayment(BaseModel):
     
     def get_payment_method_display(self):
         """Get human-readable payment method."""
-        method_names = {
-            PaymentMethod.CASH: "Cash",
-            PaymentMethod.CREDIT_CARD: "Credit Card",
-            PaymentMethod.DEBIT_CARD: "Debit Card",
-            PaymentMethod.CHECK: "Check",
-            PaymentMethod.BANK_TRANSFER: "Bank Transfer",
-            PaymentMethod.DIGITAL_WALLET: "Digital Wallet",
-            PaymentMethod.STORE_CREDIT: "Store Credit",
-            PaymentMethod.LOYALTY_POINTS: "Loyalty Points"
-        }
-        return method_names.get(self.payment_method, str(self.payment_method))
+        return _PAYMENT_METHOD_NAMES.get(self.payment_method, str(self.payment_method))
+
+
+class SalesDailyRollup(Base):
+    """
+    Per-day sales totals by tenant, store and status, for reporting.
+
+    MySQL has no materialized views, so this is a plain table rebuilt from
+    sales by refresh(); dashboards read one row per day instead of
+    aggregating every sale.
+    """
+    __tablename__ = "sales_daily_rollup"
+    __table_args__ = (
+        Index("ix_sales_daily_rollup_tenant_store_day", "tenant_id", "store_id", "day"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, nullable=False)
+    store_id = Column(Integer, nullable=True)
+    day = Column(Date, nullable=False)
+    status = Column(Enum(SaleStatus), nullable=False)
+    
+    sale_count = Column(Integer, default=0, nullable=False)
+    total_amount = Column(Numeric(14, 2), default=0, nullable=False)
+    tax_amount = Column(Numeric(14, 2), default=0, nullable=False)
+    refunded_amount = Column(Numeric(14, 2), default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<SalesDailyRollup(tenant_id={self.tenant_id}, store_id={self.store_id}, day={self.day}, status='{self.status}')>"
+    
+    @classmethod
+    def refresh(cls, session, since: date, until: date = None):
+        """
+        Rebuild the rollup rows for days from since up to (not including) until.
+
+        Meant for a nightly job; the covered days are replaced with one
+        DELETE and one INSERT ... SELECT ... GROUP BY. Sales are filtered on
+        the bare sale_date so the range can use its indexes; DATE() is only
+        applied when grouping.
+        """
+        day = func.date(Sale.sale_date)
+        
+        delete_stmt = delete(cls).where(cls.day >= since)
+        source = select(
+            Sale.tenant_id,
+            Sale.store_id,
+            day,
+            Sale.status,
+            func.count(Sale.id),
+            func.sum(Sale.total_amount),
+            func.sum(Sale.tax_amount),
+            func.sum(Sale.refunded_amount)
+        ).where(Sale.sale_date >= datetime.combine(since, time.min))
+        if until is not None:
+            delete_stmt = delete_stmt.where(cls.day < until)
+            source = source.where(Sale.sale_date < datetime.combine(until, time.min))
+        
+        session.execute(delete_stmt)
+        session.execute(
+            insert(cls).from_select(
+                [
+                    "tenant_id", "store_id", "day", "status", "sale_count",
+                    "total_amount", "tax_amount", "refunded_amount"
+                ],
+                source.group_by(Sale.tenant_id, Sale.store_id, day, Sale.status)
+            )
+        )
@@ -2,11 +2,28 @@
 Store model for multi-store support.
 """
 
+from functools import cached_property
+from types import MappingProxyType
 from sqlalchemy import Column, String, Text, Boolean, ForeignKey, JSON, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import event, select
+from sqlalchemy.orm import object_session, relationship
 from app.models.base import BaseModel, TenantMixin
 
 
+# Columns full_address is built from, in display order
+_ADDRESS_COLUMNS = ("address_line1", "address_line2", "city", "state", "postal_code", "country")
+
+_DEFAULT_OPENING_HOURS = MappingProxyType({
+    "monday": MappingProxyType({"open": "09:00", "close": "18:00", "is_open": True}),
+    "tuesday": MappingProxyType({"open": "09:00", "close": "18:00", "is_open": True}),
+    "wednesday": MappingProxyType({"open": "09:00", "close": "18:00", "is_open": True}),
+    "thursday": MappingProxyType({"open": "09:00", "close": "18:00", "is_open": True}),
+    "friday": MappingProxyType({"open": "09:00", "close": "18:00", "is_open": True}),
+    "saturday": MappingProxyType({"open": "10:00", "close": "16:00", "is_open": True}),
+    "sunday": MappingProxyType({"open": None, "close": None, "is_open": False})
+})
+
+
 class Store(BaseModel, TenantMixin):
     """
     Store model for multi-store operations within a tenant.
@@ -55,18 +72,12 @@ class Store(BaseModel, TenantMixin):
     def __repr__(self):
         return f"<Store(id={self.id}, name='{self.name}', code='{self.code}')>"
     
-    @property
+    @cached_property
     def full_address(self):
         """Get formatted full address."""
-        address_parts = [
-            self.address_line1,
-            self.address_line2,
-            self.city,
-            self.state,
-            self.postal_code,
-            self.country
-        ]
-        return ", ".join([part for part in address_parts if part])
+        return ", ".join(
+            part for part in (getattr(self, column) for column in _ADDRESS_COLUMNS) if part
+        )
     
     def get_setting(self, key: str, default=None):
         """Get a specific store setting."""
@@ -118,31 +129,61 @@ class Store(BaseModel, TenantMixin):
             return True  # Default to open if no hours set
         return hours.get("is_open", True)
     
-    def get_default_opening_hours(self):
-        """Get default opening hours template."""
-        return {
-            "monday": {"open": "09:00", "close": "18:00", "is_open": True},
-            "tuesday": {"open": "09:00", "close": "18:00", "is_open": True},
-            "wednesday": {"open": "09:00", "close": "18:00", "is_open": True},
-            "thursday": {"open": "09:00", "close": "18:00", "is_open": True},
-            "friday": {"open": "09:00", "close": "18:00", "is_open": True},
-            "saturday": {"open": "10:00", "close": "16:00", "is_open": True},
-            "sunday": {"open": None, "close": None, "is_open": False}
-        }
+    def get_default_opening_hours(self, copy: bool = True):
+        """
+        Get default opening hours template.
+
+        Returns a fresh dict that is safe to store and edit; pass copy=False
+        for a shared read-only view when only reading it.
+        """
+        if not copy:
+            return _DEFAULT_OPENING_HOURS
+        return {day: dict(hours) for day, hours in _DEFAULT_OPENING_HOURS.items()}
     
     def get_inventory_value(self):
         """Calculate total inventory value for this store."""
+        session = object_session(self)
+        if session is not None and "inventory_items" not in self.__dict__:
+            from app.models.inventory import InventoryItem
+            return InventoryItem.report_total_value(session, self.tenant_id, self.id)
+        
         total_value = 0
         for item in self.inventory_items:
             if item.is_active and not item.is_deleted:
                 total_value += (item.quantity_on_hand or 0) * (item.unit_cost or 0)
         return total_value
     
+    def low_stock_items_query(self, threshold: int = None):
+        """
+        Build a SELECT for items with low stock in this store.
+
+        Ordered by quantity on hand then id, so callers can add limit and
+        offset to paginate.
+        """
+        from app.models.inventory import InventoryItem
+        if threshold is None:
+            threshold = self.get_setting("low_stock_threshold", 10)
+        
+        return (
+            select(InventoryItem)
+            .where(
+                InventoryItem.store_id == self.id,
+                InventoryItem.is_active.is_(True),
+                InventoryItem.is_deleted.is_(False),
+                InventoryItem.quantity_on_hand <= threshold
+            )
+            .order_by(InventoryItem.quantity_on_hand, InventoryItem.id)
+        )
+    
     def get_low_stock_items(self, threshold: int = None):
         """Get items with low stock in this store."""
         if threshold is None:
             threshold = self.get_setting("low_stock_threshold", 10)
         
+        session = object_session(self)
+        if session is not None and "inventory_items" not in self.__dict__:
+            return session.execute(self.low_stock_items_query(threshold)).scalars().all()
+        
         low_stock_items = []
         for item in self.inventory_items:
             if (item.is_active and not item.is_deleted and 
@@ -151,3 +192,14 @@ class Store(BaseModel, TenantMixin):
                 low_stock_items.append(item)
         
         return low_stock_items
+
+
+def _forget_full_address(target, *args):
+    """Drop the cached full address when the store's address changes or it is expired."""
+    target.__dict__.pop("full_address", None)
+
+
+event.listen(Store, "expire", _forget_full_address)
+event.listen(Store, "refresh", _forget_full_address)
+for _column in _ADDRESS_COLUMNS:
+    event.listen(getattr(Store, _column), "set", _forget_full_address)
@@ -66,7 +66,13 @@ class User(BaseModel, TenantMixin):
         from app.core.security import PermissionChecker
         return PermissionChecker.has_permission(self.role, permission)
     
-    def get_permissions(self) -> list:
+    @property
+    def permission_mask(self) -> int:
+        """Get the permission bitmask for this user's role."""
+        from app.core.permissions import role_permission_mask
+        return role_permission_mask(self.role)
+    
+    def get_permissions(self) -> frozenset:
         """Get all permissions for this user."""
         from app.core.security import PermissionChecker
         return PermissionChecker.get_role_permissions(self.role)
@@ -109,7 +115,7 @@ class User(BaseModel, TenantMixin):
         # Add computed fields
         data['full_name'] = self.full_name
         data['display_name'] = self.display_name
-        data['permissions'] = self.get_permissions()
+        data['permissions'] = sorted(self.get_permissions())
         
         return data
 
@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
+from app.core.cache import invalidate_cached_user
 from app.core.security import verify_password, get_password_hash
 from app.models.user import User
 from app.schemas.auth import UserRegister
@@ -34,7 +35,7 @@ class AuthService:
         if not user:
             return None
         
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password(password, user.hashed_password):
             return None
         
         return user
@@ -85,12 +86,13 @@ class AuthService:
         Change user password.
         """
         # Verify current password
-        if not verify_password(current_password, user.hashed_password):
+        if not await verify_password(current_password, user.hashed_password):
             raise ValueError("Current password is incorrect")
         
         # Update password
         user.hashed_password = get_password_hash(new_password)
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
@@ -131,6 +133,7 @@ class AuthService:
         """
         user.is_active = False
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
@@ -140,6 +143,7 @@ class AuthService:
         """
         user.is_active = True
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
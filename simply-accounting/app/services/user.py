@@ -2,19 +2,21 @@
 User service for user management operations.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select
 
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.cache import invalidate_cached_user
 from app.core.security import get_password_hash
 
 
 class UserService:
     """Service for user management operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
     
     async def create_user(self, user_data: UserCreate) -> User:
@@ -75,6 +77,21 @@ class UserService:
             )
         ).first()
     
+    async def aget_user_by_username(self, username: str) -> Optional[User]:
+        """
+        Get user by username using an async session.
+        """
+        result = await self.db.execute(
+            select(User).where(
+                and_(
+                    User.username == username.lower(),
+                    User.is_active == True,
+                    User.is_deleted == False
+                )
+            )
+        )
+        return result.scalars().first()
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """
         Get user by email.
@@ -179,6 +196,7 @@ class UserService:
                 setattr(user, field, value)
         
         self.db.commit()
+        invalidate_cached_user(user.username)
         self.db.refresh(user)
         
         return user
@@ -193,6 +211,7 @@ class UserService:
         
         user.soft_delete()
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
@@ -209,6 +228,7 @@ class UserService:
             user.restore()
         
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
@@ -222,6 +242,7 @@ class UserService:
         
         user.is_active = False
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
@@ -239,6 +260,7 @@ class UserService:
         
         user.role = new_role
         self.db.commit()
+        invalidate_cached_user(user.username)
         
         return True
     
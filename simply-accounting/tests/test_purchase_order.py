@@ -0,0 +1,38 @@
+"""
+Tests for purchase order item handling.
+"""
+
+from decimal import Decimal
+
+import app.models  # noqa: F401  (configure every mapper)
+from app.models.purchase import PurchaseOrder
+
+
+def _new_purchase_order():
+    return PurchaseOrder(
+        discount_amount=Decimal("0"),
+        shipping_cost=Decimal("0"),
+        tax_rate=None
+    )
+
+
+def test_add_item_adds_new_line():
+    purchase_order = _new_purchase_order()
+    
+    purchase_order.add_item(product_id=1, quantity=Decimal("2"), unit_cost=Decimal("5"))
+    
+    assert len(purchase_order.po_items) == 1
+    assert purchase_order.po_items[0].quantity_received == 0
+    assert purchase_order.subtotal == Decimal("10.00")
+    assert purchase_order.get_item_totals() == (1, Decimal("10.00"), Decimal("2"), 0, 1)
+
+
+def test_add_item_merges_existing_line():
+    purchase_order = _new_purchase_order()
+    
+    purchase_order.add_item(product_id=1, quantity=Decimal("2"), unit_cost=Decimal("5"))
+    purchase_order.add_item(product_id=2, quantity=Decimal("1"), unit_cost=Decimal("3"))
+    purchase_order.add_item(product_id=1, quantity=Decimal("10"), unit_cost=Decimal("5"))
+    
+    assert len(purchase_order.po_items) == 2
+    assert purchase_order.subtotal == Decimal("63.00")